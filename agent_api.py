@@ -6,27 +6,54 @@ completing tasks, sending notifications, and syncing with Google Tasks.
 """
 
 import logging
+import re
+from types import MappingProxyType
 from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, time
 
 from db import Work, Task
 from core.work import WorkStatus
 from core.task import TaskStatus
 from core.storage import (
-    list_works, list_tasks, get_work_by_id, get_task_by_id,
-    create_work, create_task, update_work_status, update_task_status,
-    get_today_tasks
+    list_works, list_works_with_counts, list_next_tasks_by_work, list_tasks, list_task_rows,
+    list_overdue_task_rows, get_work_by_id, get_task_by_id, get_calendar_task_for_work,
+    create_work, create_task, update_work_status, update_task_status, complete_task_returning_event,
+    get_today_tasks, list_task_ids_missing_due_date
 )
 from core.slack import get_notifier
 from core.tasks_provider import get_provider
 from core.scheduling import (
     ensure_task_scheduled, complete_task_and_schedule_next,
-    sync_from_google_tasks, delete_task_from_calendar
+    sync_from_google_tasks, delete_task_from_calendar, set_due_date_sync_dispatcher
 )
-from core.due_dates import DueDateManager, bulk_set_due_dates
+from core.due_dates import DueDateManager, get_due_date_manager, bulk_set_due_dates
 
 logger = logging.getLogger(__name__)
 
+# Unbound isoformat, resolved once: listing loops call it per row without a
+# bound-method lookup on every datetime. Results stay JSON-safe strings since
+# they are returned to agent tools as-is.
+_iso = datetime.isoformat
+
+# Slack due-date pickers send YYYY-MM-DD; tasks are due at 8am on that day
+_YMD_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+_DUE_TIME = time(8, 0)
+
+# Status filter aliases accepted from agents/users (None means no filter)
+_WORK_STATUS_ALIASES = MappingProxyType({
+    'in_progress': 'published',
+    'active': 'published',
+    'done': 'completed',
+    'all': None
+})
+
+_TASK_STATUS_ALIASES = MappingProxyType({
+    'active': 'tracked',
+    'in_progress': 'tracked',
+    'done': 'completed',
+    'all': None
+})
+
 
 # ===== Work Listing & Management =====
 
@@ -39,33 +66,23 @@ def list_works_by_status(status: str) -> List[Dict[str, Any]]:
     Returns:
         List of work dictionaries with basic info
     """
-    # Map common aliases
-    status_map = {
-        'in_progress': 'published',
-        'active': 'published',
-        'done': 'completed',
-        'all': None
-    }
-    
-    status_key = status_map.get(status.lower(), status.lower())
+    status_lower = status.lower()
+    status_key = _WORK_STATUS_ALIASES.get(status_lower, status_lower)
     
     if status_key:
         work_status = WorkStatus.from_string(status_key)
-        works = list_works(status=work_status, include_tasks=True)
+        works = list_works_with_counts(status=work_status)
     else:
-        works = list_works(include_tasks=True)
+        works = list_works_with_counts()
     
     result = []
-    for work in works:
-        task_count = len(work.tasks) if hasattr(work, 'tasks') else 0
-        completed_count = sum(1 for t in work.tasks if t.status == str(TaskStatus.COMPLETED)) if hasattr(work, 'tasks') else 0
-        
+    for work, task_count, completed_count in works:
         result.append({
             'id': work.id,
             'title': work.title,
             'description': work.description,
             'status': work.status,
-            'created_at': work.created_at.isoformat() if work.created_at else None,
+            'created_at': _iso(work.created_at) if work.created_at else None,
             'task_count': task_count,
             'completed_tasks': completed_count,
             'progress': f"{completed_count}/{task_count}" if task_count > 0 else "0/0"
@@ -85,7 +102,7 @@ def compute_work_snooze_count(work) -> int:
     """
     if not hasattr(work, 'tasks'):
         return 0
-    return sum(task.snooze_count for task in work.tasks)
+    return sum(task.snooze_count or 0 for task in work.tasks)
 
 
 def get_work_details(work_id: int) -> Optional[Dict[str, Any]]:
@@ -102,8 +119,11 @@ def get_work_details(work_id: int) -> Optional[Dict[str, Any]]:
         return None
     
     tasks = []
+    snooze_total = 0
     if hasattr(work, 'tasks'):
         for task in work.tasks:
+            # Accumulate snoozes in the same pass instead of re-walking work.tasks
+            snooze_total += task.snooze_count or 0
             tasks.append({
                 'id': task.id,
                 'title': task.title,
@@ -111,7 +131,7 @@ def get_work_details(work_id: int) -> Optional[Dict[str, Any]]:
                 'order_index': task.order_index,
                 'priority': task.priority,
                 'status': task.status,
-                'due_date': task.due_date.isoformat() if task.due_date else None,
+                'due_date': _iso(task.due_date) if task.due_date else None,
                 'snooze_count': task.snooze_count,
                 'has_calendar_event': bool(task.calendar_event_id),
                 'calendar_event_id': task.calendar_event_id
@@ -123,8 +143,8 @@ def get_work_details(work_id: int) -> Optional[Dict[str, Any]]:
         'description': work.description,
         'status': work.status,
         'expected_completion_hint': work.expected_completion_hint,
-        'created_at': work.created_at.isoformat() if work.created_at else None,
-        'snooze_count': compute_work_snooze_count(work),
+        'created_at': _iso(work.created_at) if work.created_at else None,
+        'snooze_count': snooze_total,
         'tasks': tasks
     }
 
@@ -138,20 +158,19 @@ def get_recently_completed_works(days: int = 7) -> List[Dict[str, Any]]:
     Returns:
         List of completed work dictionaries
     """
-    completed_works = list_works(status=WorkStatus.COMPLETED, include_tasks=True)
+    completed_works = list_works_with_counts(status=WorkStatus.COMPLETED)
     cutoff = datetime.utcnow() - timedelta(days=days)
     
     recent = []
-    for work in completed_works:
+    for work, task_count, _ in completed_works:
         # Filter by completion (approximated by created_at for now, could add completed_at field)
         if work.created_at and work.created_at >= cutoff:
-            task_count = len(work.tasks) if hasattr(work, 'tasks') else 0
             recent.append({
                 'id': work.id,
                 'title': work.title,
                 'status': work.status,
                 'task_count': task_count,
-                'created_at': work.created_at.isoformat()
+                'created_at': _iso(work.created_at)
             })
     
     return recent
@@ -163,32 +182,20 @@ def get_upcoming_works() -> List[Dict[str, Any]]:
     Returns:
         List of work dictionaries with next task info
     """
-    works = list_works(status=WorkStatus.PUBLISHED, include_tasks=True)
+    rows = list_next_tasks_by_work(status=WorkStatus.PUBLISHED)
     
     result = []
-    for work in works:
-        if not hasattr(work, 'tasks') or not work.tasks:
-            continue
-        
-        # Find next incomplete task
-        incomplete_tasks = [t for t in work.tasks if t.status != str(TaskStatus.COMPLETED)]
-        if not incomplete_tasks:
-            continue
-        
-        # Sort by due date
-        incomplete_tasks.sort(key=lambda t: t.due_date if t.due_date else datetime.max)
-        next_task = incomplete_tasks[0]
-        
+    for row in rows:
         result.append({
-            'id': work.id,
-            'title': work.title,
-            'status': work.status,
+            'id': row.work_id,
+            'title': row.work_title,
+            'status': row.work_status,
             'next_task': {
-                'id': next_task.id,
-                'title': next_task.title,
-                'due_date': next_task.due_date.isoformat() if next_task.due_date else None
+                'id': row.task_id,
+                'title': row.task_title,
+                'due_date': _iso(row.due_date) if row.due_date else None
             },
-            'remaining_tasks': len(incomplete_tasks)
+            'remaining_tasks': row.remaining_tasks
         })
     
     return result
@@ -206,38 +213,23 @@ def list_tasks_by_status(status: str, work_id: Optional[int] = None) -> List[Dic
     Returns:
         List of task dictionaries
     """
-    # Map common aliases
-    status_map = {
-        'active': 'tracked',
-        'in_progress': 'tracked',
-        'done': 'completed',
-        'all': None
-    }
+    status_lower = status.lower()
+    status_key = _TASK_STATUS_ALIASES.get(status_lower, status_lower)
+    task_status = TaskStatus.from_string(status_key) if status_key else None
     
-    status_key = status_map.get(status.lower(), status.lower())
+    # Plain column rows: no Task/Work instances or identity-map bookkeeping per row
+    rows = list_task_rows(work_id=work_id, status=task_status)
     
-    if status_key:
-        task_status = TaskStatus.from_string(status_key)
-        tasks = list_tasks(work_id=work_id, status=task_status)
-    else:
-        tasks = list_tasks(work_id=work_id)
-    
-    result = []
-    for task in tasks:
-        work_title = task.work.title if hasattr(task, 'work') else "Unknown"
-        
-        result.append({
-            'id': task.id,
-            'title': task.title,
-            'status': task.status,
-            'work_id': task.work_id,
-            'work_title': work_title,
-            'due_date': task.due_date.isoformat() if task.due_date else None,
-            'snooze_count': task.snooze_count,
-            'has_calendar_event': bool(task.calendar_event_id)
-        })
-    
-    return result
+    return [{
+        'id': row.id,
+        'title': row.title,
+        'status': row.status,
+        'work_id': row.work_id,
+        'work_title': row.work_title or "Unknown",
+        'due_date': _iso(row.due_date) if row.due_date else None,
+        'snooze_count': row.snooze_count,
+        'has_calendar_event': bool(row.calendar_event_id),
+    } for row in rows]
 
 
 def get_today_tasks_summary() -> List[Dict[str, Any]]:
@@ -246,21 +238,18 @@ def get_today_tasks_summary() -> List[Dict[str, Any]]:
     Returns:
         List of task dictionaries due today
     """
-    tasks = get_today_tasks()
+    start = datetime.combine(date.today(), datetime.min.time())
+    # Plain column rows: no Task/Work instances or identity-map bookkeeping per row
+    rows = list_task_rows(due_after=start, due_before=start + timedelta(days=1),
+                          exclude_completed=True)
     
-    result = []
-    for task in tasks:
-        work_title = task.work.title if hasattr(task, 'work') else "Unknown"
-        
-        result.append({
-            'id': task.id,
-            'title': task.title,
-            'status': task.status,
-            'work_title': work_title,
-            'due_date': task.due_date.isoformat() if task.due_date else None
-        })
-    
-    return result
+    return [{
+        'id': row.id,
+        'title': row.title,
+        'status': row.status,
+        'work_title': row.work_title,
+        'due_date': _iso(row.due_date)
+    } for row in rows]
 
 
 def get_overdue_tasks() -> List[Dict[str, Any]]:
@@ -269,24 +258,16 @@ def get_overdue_tasks() -> List[Dict[str, Any]]:
     Returns:
         List of overdue task dictionaries
     """
-    now = datetime.utcnow()
-    tasks = list_tasks(due_before=now, exclude_completed=True)
-    
-    result = []
-    for task in tasks:
-        work_title = task.work.title if hasattr(task, 'work') else "Unknown"
-        days_overdue = (now - task.due_date).days if task.due_date else 0
-        
-        result.append({
-            'id': task.id,
-            'title': task.title,
-            'status': task.status,
-            'work_title': work_title,
-            'due_date': task.due_date.isoformat() if task.due_date else None,
-            'days_overdue': days_overdue
-        })
+    rows = list_overdue_task_rows(datetime.utcnow())
     
-    return result
+    return [{
+        'id': row.id,
+        'title': row.title,
+        'status': row.status,
+        'work_title': row.work_title,
+        'due_date': _iso(row.due_date),
+        'days_overdue': row.days_overdue
+    } for row in rows]
 
 
 def get_weekly_tasks_summary(start_date: Optional[datetime] = None) -> Dict[str, Any]:
@@ -310,46 +291,41 @@ def get_weekly_tasks_summary(start_date: Optional[datetime] = None) -> Dict[str,
     start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
     end_date = start_date + timedelta(days=7)
     
-    # Get all non-completed tasks in the date range
-    tasks = list_tasks(due_after=start_date, due_before=end_date, exclude_completed=False)
+    # Columnar rows rather than ORM objects; only the fields the summary needs
+    rows = list_task_rows(due_after=start_date, due_before=end_date)
     
     # Categorize tasks
-    completed = []
+    buckets = {'completed': [], 'tracked': []}
     pending = []
-    in_progress = []
     
-    for task in tasks:
-        work_title = task.work.title if hasattr(task, 'work') else "Unknown"
+    for row in rows:
         task_dict = {
-            'id': task.id,
-            'title': task.title,
-            'status': task.status,
-            'work_id': task.work_id,
-            'work_title': work_title,
-            'due_date': task.due_date.isoformat() if task.due_date else None
+            'id': row.id,
+            'title': row.title,
+            'status': row.status,
+            'work_id': row.work_id,
+            'work_title': row.work_title,
+            'due_date': _iso(row.due_date) if row.due_date else None
         }
-        
-        if task.status.lower() == 'completed':
-            completed.append(task_dict)
-        elif task.status.lower() == 'tracked':
-            in_progress.append(task_dict)
-        else:
-            pending.append(task_dict)
+        buckets.get(row.status.lower(), pending).append(task_dict)
+    
+    completed = buckets['completed']
+    in_progress = buckets['tracked']
     
     return {
         'week_start': start_date.strftime('%Y-%m-%d'),
         'week_end': end_date.strftime('%Y-%m-%d'),
-        'total_tasks': len(tasks),
+        'total_tasks': len(rows),
         'completed': completed,
         'in_progress': in_progress,
         'draft': pending,
-        'completion_rate': f"{len(completed)}/{len(tasks)}" if tasks else "0/0"
+        'completion_rate': f"{len(completed)}/{len(rows)}" if rows else "0/0"
     }
 
 
 # ===== Task Operations =====
 
-def set_task_due_date(task_id: int, due_date: datetime, source: str = "agent") -> bool:
+def set_task_due_date(task_id: int, due_date: datetime, source: str = "agent") -> Optional[Task]:
     """Set due date for a task.
     
     Args:
@@ -358,13 +334,13 @@ def set_task_due_date(task_id: int, due_date: datetime, source: str = "agent") -
         source: Source of the update
         
     Returns:
-        True if set successfully
+        Updated Task object, or None if not found
     """
-    manager = DueDateManager()
+    manager = get_due_date_manager()
     return manager.set_due_date(task_id, due_date, source=source)
 
 
-def snooze_task(task_id: int, days: int = 1) -> bool:
+def snooze_task(task_id: int, days: int = 1) -> Optional[Task]:
     """Snooze a task by moving its due date forward.
     
     Args:
@@ -372,20 +348,20 @@ def snooze_task(task_id: int, days: int = 1) -> bool:
         days: Number of days to snooze
         
     Returns:
-        True if snoozed successfully
+        Updated Task object (with its new snooze_count), or None if it failed
     """
-    manager = DueDateManager()
+    manager = get_due_date_manager()
     return manager.snooze_task(task_id, days)
 
 
-def complete_task_flow(task_id: int) -> bool:
+def complete_task_flow(task_id: int) -> Optional[Task]:
     """Complete a task and schedule the next one in the work.
     
     Args:
         task_id: Task ID to complete
         
     Returns:
-        True if completed successfully
+        The completed task, or None if the task or its work wasn't found
     """
     return complete_task_and_schedule_next(task_id)
 
@@ -399,13 +375,12 @@ def mark_task_complete(task_id: int) -> bool:
     Returns:
         True if marked successfully
     """
-    result = update_task_status(task_id, TaskStatus.COMPLETED)
-    if result:
+    found, calendar_event_id = complete_task_returning_event(task_id)
+    if found:
         # Also mark in Google Tasks
-        task = get_task_by_id(task_id)
-        if task and task.calendar_event_id:
+        if calendar_event_id:
             provider = get_provider()
-            provider.complete_task(task.calendar_event_id)
+            provider.complete_task(calendar_event_id)
         return True
     return False
 
@@ -476,21 +451,17 @@ def send_work_publish_notification(work_id: int) -> bool:
     Returns:
         True if sent successfully
     """
-    work = get_work_by_id(work_id, include_tasks=True)
+    work = get_work_by_id(work_id, include_tasks=False)
     if not work:
         logger.error(f"Work {work_id} not found")
         return False
     
-    # Find the tracked/scheduled task
-    calendar_task = None
-    if hasattr(work, 'tasks'):
-        for task in work.tasks:
-            if task.calendar_event_id or task.status == str(TaskStatus.TRACKED):
-                calendar_task = task
-                break
+    # Fetch only the tracked/scheduled task rather than every task of the work
+    calendar_task = get_calendar_task_for_work(work_id)
     
     notifier = get_notifier()
-    return notifier.send_publish(work, calendar_task)
+    # Posted by the Celery worker, so publishing doesn't wait on Slack
+    return notifier.send_publish(work, calendar_task, background=True)
 
 
 def send_daily_reminder() -> bool:
@@ -540,8 +511,30 @@ def sync_task_from_calendar(task_id: int) -> bool:
     return sync_from_google_tasks(task_id)
 
 
+def _queue_due_date_sync(job: List[List[str]]) -> bool:
+    """Queue a bulk Google Tasks due date sync on the Celery worker (False if the broker is down)."""
+    import celery_app
+    return celery_app.try_publish(celery_app.sync_task_due_dates, [(job,)])
+
+
+# core.scheduling stays free of Celery; bulk reschedules reach the worker through here
+set_due_date_sync_dispatcher(_queue_due_date_sync)
+
+
 # ===== Workflow Helpers =====
 
+def tasks_missing_due_dates(work_id: int) -> Optional[List[int]]:
+    """Get the incomplete tasks of a work that still need a due date.
+    
+    Args:
+        work_id: Work item ID
+        
+    Returns:
+        List of task IDs (empty if none), or None if the work doesn't exist
+    """
+    return list_task_ids_missing_due_date(work_id)
+
+
 def publish_work_flow(work_id: int, schedule_first_task: bool = True) -> bool:
     """Publish a work item and optionally schedule its first task.
     
@@ -674,15 +667,21 @@ def update_tasks_due_dates_from_slack(due_date_map: Dict[int, str]) -> bool:
         True if all updated successfully
     """
     datetime_map = {}
+    parsed = {}  # Tasks are usually spread over a few distinct days
     for task_id, date_str in due_date_map.items():
-        try:
-            # Parse YYYY-MM-DD and set to 8am
-            dt = datetime.strptime(date_str, '%Y-%m-%d')
-            dt = dt.replace(hour=8, minute=0, second=0, microsecond=0)
-            datetime_map[task_id] = dt
-        except ValueError:
-            logger.error(f"Invalid date format for task {task_id}: {date_str}")
-            return False
+        dt = parsed.get(date_str)
+        if dt is None:
+            # Parse YYYY-MM-DD and set to 8am (date.fromisoformat is C-level, unlike strptime)
+            if not isinstance(date_str, str) or not _YMD_RE.fullmatch(date_str):
+                logger.error(f"Invalid date format for task {task_id}: {date_str}")
+                return False
+            try:
+                dt = datetime.combine(date.fromisoformat(date_str), _DUE_TIME)
+            except ValueError:
+                logger.error(f"Invalid date format for task {task_id}: {date_str}")
+                return False
+            parsed[date_str] = dt
+        datetime_map[task_id] = dt
     
     results = bulk_set_due_dates(datetime_map)
     return all(results.values())
@@ -720,6 +719,29 @@ def record_conversation_feedback(
     )
 
 
+def record_conversation_feedback_bulk(feedback: List[Dict[str, Any]]) -> List[Optional[int]]:
+    """Record several conversation feedback entries in one database write.
+    
+    Args:
+        feedback: Dicts with record_conversation_feedback's keyword arguments
+        
+    Returns:
+        Feedback log IDs in input order (None where the write failed)
+    """
+    from core.feedback import log_conversation_feedback_bulk
+    
+    return log_conversation_feedback_bulk([
+        {
+            'conversation_summary': item['conversation_summary'],
+            'what_went_well': item.get('what_went_well'),
+            'what_could_improve': item.get('what_could_improve'),
+            'user_satisfaction_estimate': item.get('user_satisfaction'),
+            'context_tags': item.get('tags'),
+        }
+        for item in feedback
+    ])
+
+
 def get_learning_insights() -> Dict[str, Any]:
     """Get active learning context for behavior optimization.
     
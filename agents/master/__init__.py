@@ -1,3 +1,10 @@
-from .agent import root_agent
+def __getattr__(name):
+    # Import the agent module (and build the ADK agent) only when root_agent is
+    # requested, so importing master.tools / master.session_tracker stays cheap
+    if name == 'root_agent':
+        from .agent import root_agent
+        return root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-__all__ = ['root_agent']
\ No newline at end of file
+
+__all__ = ['root_agent']
@@ -1,49 +1,152 @@
 import os
+import asyncio
+import functools
 import logging
-import sys
-from pathlib import Path
-from typing import Any, Optional
+from collections import deque
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
 from dotenv import load_dotenv
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import Agent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models.llm_response import LlmResponse
 from google.adk.sessions.session import Session
+from google.adk.tools.function_tool import FunctionTool
+from google.genai import types
 
-# Add project root to Python path
-project_root = Path(__file__).parent.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
-
-from .instructions import INSTRUCTION
+from .instructions import BASE_INSTRUCTION, build_instruction, classify_intent
 from .tools import TOOLS
+from .notify_queue import get_notification_queue, set_notification_scope
+from . import read_cache
 from .session_tracker import get_session_tracker
 
 logger = logging.getLogger(__name__)
-load_dotenv()
-gmp_key = os.getenv('GMP_API_KEY')
 
-# Global session tracker - shared across agent instances
-_session_tracker = get_session_tracker()
+
+@functools.cache
+def _config() -> Dict[str, Any]:
+    """Load .env on first use and return env-derived agent settings."""
+    load_dotenv()
+    return {
+        'gmp_api_key': os.getenv('GMP_API_KEY'),
+    }
+
+
+# Per-type extractors, resolved on first sight of a type so later calls are one
+# dict lookup instead of a chain of isinstance/hasattr checks
+_SESSION_ID_EXTRACTORS: Dict[type, Callable[[Any], str]] = {}
+_MESSAGE_EXTRACTORS: Dict[type, Callable[[Any], str]] = {}
+
+
+def _resolve_session_id_extractor(session: Any) -> Callable[[Any], str]:
+    """Pick the session ID extractor for session's type."""
+    if hasattr(session, 'id'):
+        return lambda s: str(s.id)
+    elif hasattr(session, 'session_id'):
+        return lambda s: str(s.session_id)
+    return lambda s: 'default'
 
 
 def _extract_session_id(session: Optional[Session]) -> str:
     """Extract session ID from ADK session object."""
-    if session and hasattr(session, 'id'):
-        return str(session.id)
-    elif session and hasattr(session, 'session_id'):
-        return str(session.session_id)
-    return 'default'
+    if not session:
+        return 'default'
+    session_type = type(session)
+    extractor = _SESSION_ID_EXTRACTORS.get(session_type)
+    if extractor is None:
+        extractor = _SESSION_ID_EXTRACTORS[session_type] = _resolve_session_id_extractor(session)
+    return extractor(session)
 
 
-def _extract_message_content(message: Any) -> str:
-    """Extract text content from various message formats."""
+def _resolve_message_extractor(message: Any) -> Callable[[Any], str]:
+    """Pick the text extractor for message's type."""
     if isinstance(message, str):
-        return message
+        return lambda m: m
     elif hasattr(message, 'content'):
-        return str(message.content)
+        return lambda m: str(m.content)
     elif hasattr(message, 'text'):
-        return str(message.text)
+        return lambda m: str(m.text)
     elif isinstance(message, dict):
-        return message.get('content', message.get('text', str(message)))
-    return str(message)
+        return lambda m: m.get('content', m.get('text', str(m)))
+    return str
+
+
+def _extract_message_content(message: Any) -> str:
+    """Extract text content from various message formats."""
+    message_type = type(message)
+    extractor = _MESSAGE_EXTRACTORS.get(message_type)
+    if extractor is None:
+        extractor = _MESSAGE_EXTRACTORS[message_type] = _resolve_message_extractor(message)
+    return extractor(message)
+
+
+# Tracker writes are buffered during a turn and flushed in one batch, off the
+# event loop, when the turn ends (see _after_turn). Entries are
+# (session_id, role, message); message text is extracted at flush time.
+_track_buffer = deque()
+_track_flush_lock = Lock()
+
+
+def _flush_tracked_messages():
+    """Drain buffered messages into the session tracker in one batch."""
+    # Lock keeps concurrent flushes from reordering a session's messages
+    with _track_flush_lock:
+        batch = []
+        while _track_buffer:
+            session_id, role, message = _track_buffer.popleft()
+            batch.append((session_id, role, _extract_message_content(message)))
+        if batch:
+            get_session_tracker().track_messages(batch)
+
+
+def _track(session_id: str, role: str, message: Any):
+    """Buffer a message for the session tracker without blocking the caller."""
+    _track_buffer.append((session_id, role, message))
+
+
+def _content_text(content: Optional[types.Content]) -> str:
+    """Join the text parts of an ADK message content."""
+    if not content or not content.parts:
+        return ''
+    return ''.join(part.text or '' for part in content.parts)
+
+
+def _before_turn(callback_context: CallbackContext) -> None:
+    """before_agent_callback: start the turn for the invocation's session."""
+    session_id = _extract_session_id(callback_context.session)
+    # Reads this session cached during an earlier turn are not reused; other
+    # sessions' cached reads are left alone
+    read_cache.invalidate(scope=session_id)
+    # Tools called during this turn queue Slack notifications and cache reads under the session
+    set_notification_scope(session_id)
+    text = _content_text(callback_context.user_content)
+    if text:
+        _track(session_id, 'user', text)
+
+
+def _track_model_reply(callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+    """after_model_callback: track the model's text reply (or error) for the session."""
+    if llm_response.partial:
+        return None
+    session_id = _extract_session_id(callback_context.session)
+    if llm_response.error_message:
+        _track(session_id, 'assistant', f"Error: {llm_response.error_message}")
+        return None
+    text = _content_text(llm_response.content)
+    if text:
+        _track(session_id, 'assistant', text)
+    return None
+
+
+async def _after_turn(callback_context: CallbackContext) -> None:
+    """after_agent_callback: write tracked messages and send the session's queued notifications."""
+    if _track_buffer:
+        await asyncio.to_thread(_flush_tracked_messages)
+    # Send the turn's queued Slack notifications as one post
+    session_id = _extract_session_id(callback_context.session)
+    notifications = get_notification_queue()
+    if notifications.pending_count(session_id):
+        await asyncio.to_thread(notifications.flush, session_id)
 
 
 class LearningAgent(Agent):
@@ -51,45 +154,51 @@ class LearningAgent(Agent):
     
     This class extends the Google ADK Agent to add learning capabilities while
     maintaining full compatibility with the ADK framework. Uses a global session
-    tracker to avoid Pydantic field validation issues.
+    tracker to avoid Pydantic field validation issues; tracking, cache resets and
+    notification flushing are wired in as agent callbacks (see get_root_agent).
     """
-    
-    async def send(self, message: Any, session: Optional[Session] = None, **kwargs) -> Any:
-        """Override send method to track messages."""
-        session_id = _extract_session_id(session)
-        message_text = _extract_message_content(message)
-        
-        # Track user message using global tracker
-        _session_tracker.track_message(session_id, 'user', message_text)
-        
-        try:
-            # Call parent send method
-            response = await super().send(message, session=session, **kwargs)
-            
-            # Track agent response
-            if response:
-                response_text = _extract_message_content(response)
-                _session_tracker.track_message(session_id, 'assistant', response_text)
-            
-            return response
-            
-        except Exception as e:
-            logger.exception(f"Error in agent send: {e}")
-            # Track the error
-            _session_tracker.track_message(session_id, 'assistant', f"Error: {str(e)}")
-            raise
-
-
-# Create the learning agent - this is ADK-compatible and includes session tracking
-root_agent = LearningAgent(
-    model='gemini-2.0-flash',
-    name='task_assist_master_agent',
-    description='An intelligent assistant that manages work and tasks end-to-end: breaks down work into actionable tasks, schedules them, tracks progress, sends reminders, and notifies users via Slack and calendar. Handles the full workflow as described in LIFECYCLE.md and IDEA.md.',
-    instruction=INSTRUCTION,
-    tools=list(TOOLS.values())
-)
-
-logger.info("LearningAgent initialized with automatic feedback logging")
+
+
+def _turn_instruction(context: ReadonlyContext) -> str:
+    """Pick this turn's instruction fragments from the user's message."""
+    return build_instruction(classify_intent(_content_text(context.user_content)))
+
+
+_root_agent: Optional[LearningAgent] = None
+
+
+def get_root_agent() -> LearningAgent:
+    """Get or create the learning agent - ADK-compatible, with session tracking."""
+    global _root_agent
+    if _root_agent is None:
+        _root_agent = LearningAgent(
+            model='gemini-2.0-flash',
+            name='task_assist_master_agent',
+            description='An intelligent assistant that manages work and tasks end-to-end: breaks down work into actionable tasks, schedules them, tracks progress, sends reminders, and notifies users via Slack and calendar. Handles the full workflow as described in LIFECYCLE.md and IDEA.md.',
+            # Static: sent verbatim as the system instruction every turn (no {placeholder}
+            # substitution pass), giving the model a stable prefix for implicit context caching
+            static_instruction=BASE_INSTRUCTION,
+            # Per-turn fragments (creation flow, learning rules...) appended after the
+            # conversation; read-only queries skip the ones they don't need
+            instruction=_turn_instruction,
+            # Wrap tool functions once; ADK otherwise re-wraps every plain callable (signature
+            # inspection, fresh argument type-adapter cache) on each model request
+            tools=[FunctionTool(func=tool) for tool in TOOLS.values()],
+            # Session tracking and notification flushing run on the Runner's real
+            # path (adk web / adk run)
+            before_agent_callback=_before_turn,
+            after_model_callback=_track_model_reply,
+            after_agent_callback=_after_turn,
+        )
+        logger.info("LearningAgent initialized with automatic feedback logging")
+    return _root_agent
+
+
+def __getattr__(name: str) -> Any:
+    """Build root_agent on first access (PEP 562); ADK's loader reads module.root_agent."""
+    if name == 'root_agent':
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def end_session(session_id: str):
@@ -98,5 +207,7 @@ def end_session(session_id: str):
     Args:
         session_id: Session to end
     """
-    _session_tracker.end_session(session_id, explicit=True)
-    logger.info(f"Explicitly ended session: {session_id}")
+    # Make sure buffered messages are in the session before it's summarized
+    _flush_tracked_messages()
+    get_session_tracker().end_session(session_id, explicit=True)
+    logger.info("Explicitly ended session: %s", session_id)
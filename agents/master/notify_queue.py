@@ -0,0 +1,147 @@
+"""Pending Slack notifications for the agent, sent together at the end of a turn.
+
+Notification tools queue their messages here instead of posting to Slack one
+by one; flushing coalesces everything pending into a single Slack post, which
+the Celery worker sends when the broker is reachable.
+
+Messages are kept per scope (the agent sets the ADK session ID as the scope at
+the start of each turn), so flushing one session never posts another's.
+"""
+
+import atexit
+import logging
+from contextvars import ContextVar
+from threading import Lock
+from typing import Dict, List, Optional, Union
+
+from core.slack import SlackNotifier, get_notifier
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCOPE = 'default'
+
+# Scope that notifications queued in the current context belong to
+_current_scope: ContextVar[str] = ContextVar('notification_scope', default=DEFAULT_SCOPE)
+
+
+def set_notification_scope(scope: str):
+    """Queue and flush this context's notifications under scope.
+    
+    Args:
+        scope: Scope key, e.g. the ADK session ID
+    """
+    _current_scope.set(scope)
+
+
+def get_notification_scope() -> str:
+    """Return the current context's scope (DEFAULT_SCOPE outside an agent turn)."""
+    return _current_scope.get()
+
+
+class NotificationQueue:
+    """Thread-safe buffer of Slack notification messages awaiting a flush.
+    
+    Grouped alerts queued for the same work are merged into one message, shown
+    where the work's first alert was queued. Methods taking a scope default to
+    the current context's scope (see set_notification_scope).
+    """
+    
+    def __init__(self):
+        # scope -> message strings, or [work_title, changes] entries for grouped alerts
+        self._pending: Dict[str, List[Union[str, list]]] = {}
+        # scope -> {work_id -> that work's grouped alert entry in the scope's pending list}
+        self._alerts: Dict[str, Dict[int, list]] = {}
+        self._lock = Lock()
+        # Held while sending so concurrent flushes post in queue order
+        self._flush_lock = Lock()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(pending) for pending in self._pending.values())
+    
+    def pending_count(self, scope: Optional[str] = None) -> int:
+        """Number of notifications waiting in a scope.
+        
+        Args:
+            scope: Scope key (default: current scope)
+        """
+        with self._lock:
+            return len(self._pending.get(scope or _current_scope.get(), ()))
+    
+    def add_message(self, text: str, scope: Optional[str] = None):
+        """Queue a plain notification message.
+        
+        Args:
+            text: Message text
+            scope: Scope key (default: current scope)
+        """
+        scope = scope or _current_scope.get()
+        with self._lock:
+            self._pending.setdefault(scope, []).append(text)
+    
+    def add_changes(self, work_id: int, work_title: str, changes: List[str], scope: Optional[str] = None):
+        """Queue changes for a work's grouped alert, merging with any already queued.
+        
+        Args:
+            work_id: Work ID
+            work_title: Work title, shown in the alert header
+            changes: Change descriptions
+            scope: Scope key (default: current scope)
+        """
+        scope = scope or _current_scope.get()
+        with self._lock:
+            alerts = self._alerts.setdefault(scope, {})
+            entry = alerts.get(work_id)
+            if entry is None:
+                entry = alerts[work_id] = [work_title, list(changes)]
+                self._pending.setdefault(scope, []).append(entry)
+            else:
+                entry[1].extend(changes)
+    
+    def flush(self, scope: Optional[str] = None) -> bool:
+        """Send a scope's pending notifications as one Slack post.
+        
+        Args:
+            scope: Scope key (default: current scope)
+        
+        Returns:
+            True if sent successfully (or nothing was pending), False otherwise
+        """
+        scope = scope or _current_scope.get()
+        with self._flush_lock:
+            with self._lock:
+                pending = self._pending.pop(scope, None)
+                self._alerts.pop(scope, None)
+            if not pending:
+                return True
+            
+            messages = [
+                entry if isinstance(entry, str) else SlackNotifier.format_grouped_alert(*entry)
+                for entry in pending
+            ]
+            logger.info("Flushing %s queued Slack notifications for %s", len(messages), scope)
+            return get_notifier().send_batch(messages, background=True)
+    
+    def flush_all(self) -> bool:
+        """Send every scope's pending notifications, one Slack post per scope.
+        
+        Returns:
+            True if every post was sent successfully, False otherwise
+        """
+        with self._lock:
+            scopes = list(self._pending)
+        results = [self.flush(scope) for scope in scopes]
+        return all(results)
+
+
+# Global singleton instance
+_default_queue: Optional[NotificationQueue] = None
+
+
+def get_notification_queue() -> NotificationQueue:
+    """Get or create the default NotificationQueue (flushed again at exit)."""
+    global _default_queue
+    if _default_queue is None:
+        _default_queue = NotificationQueue()
+        atexit.register(_default_queue.flush_all)
+    return _default_queue
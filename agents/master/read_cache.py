@@ -0,0 +1,108 @@
+"""Short-lived memoization for the agent's read-only tools.
+
+While composing a reply the agent often repeats the same read (get_work, list_tasks...)
+with identical arguments. Results are kept for a couple of seconds so those repeats
+skip the database; tools that change data drop the cache.
+
+Results are cached per session (the notification scope the agent sets for each
+turn), so starting a turn only drops that session's reads.
+"""
+
+import functools
+import logging
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .notify_queue import get_notification_scope
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 2.0
+# Entry count past which expired results are swept out before storing another
+MAX_ENTRIES = 1024
+
+# (scope, tool name, args, sorted kwargs) -> (expiry on time.monotonic(), result)
+_entries: Dict[Tuple, Tuple[float, Any]] = {}
+_lock = Lock()
+# Callbacks run after each @invalidates tool (for caches kept outside this module)
+_write_hooks: List[Callable[[], None]] = []
+
+
+def ttl_cache(seconds: float = DEFAULT_TTL) -> Callable:
+    """Cache a read-only tool's successful results for `seconds`.
+    
+    Results containing an 'error' key are not cached. The wrapper keeps the tool's
+    signature and docstring (functools.wraps), which the agent reads to describe it.
+    
+    Args:
+        seconds: How long a result stays valid
+    """
+    def decorator(func: Callable) -> Callable:
+        name = func.__name__
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (get_notification_scope(), name, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            with _lock:
+                entry = _entries.get(key)
+            if entry is not None and entry[0] > now:
+                return entry[1]
+            
+            result = func(*args, **kwargs)
+            if not (isinstance(result, dict) and 'error' in result):
+                with _lock:
+                    if len(_entries) >= MAX_ENTRIES:
+                        _drop_expired(now)
+                    _entries[key] = (now + seconds, result)
+            return result
+        
+        return wrapper
+    return decorator
+
+
+def _drop_expired(now: float):
+    """Remove expired results (caller holds _lock)."""
+    for key in [key for key, entry in _entries.items() if entry[0] <= now]:
+        del _entries[key]
+
+
+def invalidate(prefix: Optional[str] = None, scope: Optional[str] = None):
+    """Drop cached results.
+    
+    Args:
+        prefix: Only drop results of tools whose name starts with this (default: all)
+        scope: Only drop results cached in this scope (default: every scope)
+    """
+    with _lock:
+        if prefix is None and scope is None:
+            _entries.clear()
+        else:
+            for key in [key for key in _entries
+                        if (scope is None or key[0] == scope)
+                        and (prefix is None or key[1].startswith(prefix))]:
+                del _entries[key]
+
+
+def on_write(callback: Callable[[], None]):
+    """Register a callback to run after every tool marked with @invalidates.
+    
+    Args:
+        callback: Called with no arguments
+    """
+    _write_hooks.append(callback)
+
+
+def invalidates(func: Callable) -> Callable:
+    """Mark a tool as changing data: cached reads are dropped after it runs."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            invalidate()
+            for callback in _write_hooks:
+                callback()
+    
+    return wrapper
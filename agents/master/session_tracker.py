@@ -4,79 +4,244 @@ Tracks conversation sessions and automatically logs feedback when sessions end,
 either through explicit completion or timeout/inactivity.
 """
 
+import heapq
 import logging
+import queue
+import re
+import sys
 import time
+from collections import deque
 from typing import Dict, List, Any, Optional, Tuple
-from datetime import datetime, timedelta
-from threading import Lock, Thread
+from datetime import datetime
+from threading import Event, Lock, Thread
 import atexit
 
+try:
+    import ahocorasick
+except ImportError:  # optional; the compiled regexes below are used instead
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Context tag -> keywords that mark a message with it (substring match on lowercased text)
+_TAG_KEYWORDS = {
+    'work_creation': ('create work', 'new work', 'work item'),
+    'due_dates': ('due date', 'deadline', 'when', 'schedule'),
+    'publishing': ('publish', 'start tracking'),
+    'status_check': ('status', 'progress', 'how is'),
+    'snoozing': ('snooze', 'postpone', 'later'),
+    'replanning': ('replan', 're-plan', 'adjust', 'change'),
+}
+_TAG_NAMES = frozenset(_TAG_KEYWORDS)
+# Tags that make even a short conversation worth logging feedback for
+_SUBSTANTIAL_TAGS = frozenset({'work_creation', 'publishing', 'replanning'})
+
+# Quality markers found in the same sweep, feeding analyze_quality's counters
+_MARKER_KEYWORDS = {
+    'confirmation': ('confirm', 'should i', 'proceed', 'go ahead'),
+    'work_created': ('created work', 'work id'),
+    'error': ('error', 'failed', "don't understand", 'confused'),
+}
+_KEYWORDS = {**_TAG_KEYWORDS, **_MARKER_KEYWORDS}
+
+
+def _build_regex(keywords: Dict[str, tuple]) -> re.Pattern:
+    """Compile label -> keywords into one lookahead regex with a named group per label.
+    
+    A single sweep reports every keyword occurrence (overlapping ones included)
+    and m.lastgroup names its label. The pattern matches UTF-8 bytes: mostly-ASCII
+    chat text is then scanned one byte per character, whatever else the message holds.
+    """
+    return re.compile(b'(?=' + b'|'.join(
+        b'(?P<' + label.encode() + b'>' + b'|'.join(re.escape(word.encode()) for word in words) + b')'
+        for label, words in keywords.items()
+    ) + b')')
+
+
+_KEYWORD_RE = _build_regex(_KEYWORDS)
+# Markers only, for sessions that have already collected every context tag
+_MARKER_RE = _build_regex(_MARKER_KEYWORDS)
+
+
+def _build_automaton(keywords: Dict[str, tuple]):
+    """Build an Aho-Corasick automaton mapping each keyword to its label (None without pyahocorasick)."""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for label, words in keywords.items():
+        for word in words:
+            automaton.add_word(word, label)
+    automaton.make_automaton()
+    return automaton
+
+
+# Single-pass multi-keyword matchers, when pyahocorasick is installed
+_KEYWORD_AUTOMATON = _build_automaton(_KEYWORDS)
+_MARKER_AUTOMATON = _build_automaton(_MARKER_KEYWORDS)
+
+
+def _find_labels(content_lower: str, markers_only: bool = False) -> set:
+    """Return the tag/marker labels whose keywords occur in lowercased text.
+    
+    Args:
+        content_lower: Lowercased message text
+        markers_only: Only look for quality markers, skipping context tag keywords
+    """
+    automaton = _MARKER_AUTOMATON if markers_only else _KEYWORD_AUTOMATON
+    if automaton is not None:
+        return {label for _, label in automaton.iter(content_lower)}
+    regex = _MARKER_RE if markers_only else _KEYWORD_RE
+    return {match.lastgroup for match in regex.finditer(content_lower.encode('utf-8', 'replace'))}
+
+
+# (time.time() of last refresh, naive UTC datetime) for _now_cached; replaced as a
+# whole so a reader on another thread never sees a timestamp without its datetime
+_clock_cache: Tuple[float, datetime] = (0.0, datetime.utcfromtimestamp(0))
+
+
+def _now_cached(ttl: float = 1.0) -> datetime:
+    """Return the current UTC time, refreshed at most every ttl seconds.
+    
+    Message timestamps only need coarse resolution, so this avoids building a
+    new datetime for every tracked message.
+    """
+    global _clock_cache
+    now = time.time()
+    cached_at, cached = _clock_cache
+    if now - cached_at > ttl:
+        cached = datetime.utcfromtimestamp(now)
+        _clock_cache = (now, cached)
+    return cached
+
+
+# Canonical role strings; add_message maps incoming roles onto these (or an interned
+# copy) so the retained history shares one object per role
+_USER = sys.intern('user')
+_ASSISTANT = sys.intern('assistant')
+
+# Most recent messages kept per session; aggregates below cover the full history
+MAX_SESSION_MESSAGES = 200
+# Characters of a long message's head and tail scanned for context tag keywords (code
+# blocks and dumps in between don't tag the session); quality markers are looked for
+# in the whole message
+SCAN_WINDOW = 2048
+SCAN_TAIL = 1024
+
 
 class ConversationSession:
-    """Tracks a single conversation session with the agent."""
+    """Tracks a single conversation session with the agent.
+    
+    Message history is stored column-wise (roles, contents, timestamps) in
+    bounded deques; `messages` rebuilds (role, content, timestamp) tuples on demand.
+    """
+    
+    __slots__ = (
+        'session_id', 'started_at', 'last_activity', '_roles', '_contents', '_timestamps',
+        'message_count', 'user_msg_count', 'agent_msg_count', 'initiated_via',
+        'context_tags', 'completed', 'seen_questions', 'confirmation_count',
+        'has_error_marker', 'work_created_marker', 'has_repeated_question',
+    )
     
     def __init__(self, session_id: str):
         self.session_id = session_id
-        self.started_at = datetime.utcnow()
-        self.last_activity = datetime.utcnow()
-        self.messages: List[Tuple[str, str, datetime]] = []  # (role, content, timestamp)
+        self.started_at = _now_cached().isoformat()  # display only
+        self.last_activity = time.monotonic()  # compared as plain floats
+        self._roles: deque = deque(maxlen=MAX_SESSION_MESSAGES)
+        self._contents: deque = deque(maxlen=MAX_SESSION_MESSAGES)
+        self._timestamps: deque = deque(maxlen=MAX_SESSION_MESSAGES)
+        self.message_count = 0
+        self.user_msg_count = 0
+        self.agent_msg_count = 0
+        self.initiated_via: Optional[str] = None  # first longer user "create"/"new" message
         self.context_tags = set()
         self.completed = False
+        # Quality signals maintained per message so analyze_quality only aggregates
+        # Hashes of assistant questions asked so far, oldest first, capped like the history
+        self.seen_questions: Dict[int, None] = {}
+        self.has_repeated_question = False
+        self.confirmation_count = 0
+        self.has_error_marker = False
+        self.work_created_marker = False
         
     def add_message(self, role: str, content: str):
         """Add a message to the conversation history."""
-        self.messages.append((role, content, datetime.utcnow()))
-        self.last_activity = datetime.utcnow()
-        
-        # Extract context tags from conversation
+        role = _USER if role == 'user' else _ASSISTANT if role == 'assistant' else sys.intern(role)
+        self._roles.append(role)
+        self._contents.append(content)
+        self._timestamps.append(_now_cached())
+        self.last_activity = time.monotonic()
+        self.message_count += 1
         content_lower = content.lower()
-        if any(word in content_lower for word in ['create work', 'new work', 'work item']):
-            self.context_tags.add('work_creation')
-        if any(word in content_lower for word in ['due date', 'deadline', 'when', 'schedule']):
-            self.context_tags.add('due_dates')
-        if any(word in content_lower for word in ['publish', 'start tracking']):
-            self.context_tags.add('publishing')
-        if any(word in content_lower for word in ['status', 'progress', 'how is']):
-            self.context_tags.add('status_check')
-        if any(word in content_lower for word in ['snooze', 'postpone', 'later']):
-            self.context_tags.add('snoozing')
-        if any(word in content_lower for word in ['replan', 're-plan', 'adjust', 'change']):
-            self.context_tags.add('replanning')
+        
+        if role is _USER:
+            self.user_msg_count += 1
+            if self.initiated_via is None and len(content) > 20 and (
+                    'create' in content_lower or 'new' in content_lower):
+                self.initiated_via = content
+        elif role is _ASSISTANT:
+            self.agent_msg_count += 1
+        
+        # Extract context tags and quality markers from conversation; once every tag
+        # has been seen only the markers can still change
+        if len(content_lower) > SCAN_WINDOW + SCAN_TAIL:
+            if len(self.context_tags) < len(_TAG_NAMES):
+                # Newline keeps a keyword from matching across the cut
+                window = f"{content_lower[:SCAN_WINDOW]}\n{content_lower[-SCAN_TAIL:]}"
+                self.context_tags.update(_find_labels(window) & _TAG_NAMES)
+            labels = _find_labels(content_lower, markers_only=True)
+        elif len(self.context_tags) < len(_TAG_NAMES):
+            labels = _find_labels(content_lower)
+            self.context_tags.update(labels & _TAG_NAMES)
+        else:
+            labels = _find_labels(content_lower, markers_only=True)
+        if 'error' in labels:
+            self.has_error_marker = True
+        if 'work_created' in labels:
+            self.work_created_marker = True
+        if role is _ASSISTANT:
+            if 'confirmation' in labels:
+                self.confirmation_count += 1
+            if '?' in content and not self.has_repeated_question:
+                self._note_question(content)
+    
+    def _note_question(self, content: str):
+        """Record an assistant question, flagging the session if it was asked before."""
+        key = hash(content)
+        if key in self.seen_questions:
+            self.has_repeated_question = True
+            return
+        if len(self.seen_questions) >= MAX_SESSION_MESSAGES:
+            # Forget the oldest question, as the message history does
+            del self.seen_questions[next(iter(self.seen_questions))]
+        self.seen_questions[key] = None
+    
+    @property
+    def messages(self) -> List[Tuple[str, str, datetime]]:
+        """Retained history as (role, content, timestamp) tuples."""
+        return list(zip(self._roles, self._contents, self._timestamps))
     
     def is_inactive(self, timeout_minutes: int = 10) -> bool:
         """Check if session has been inactive for timeout period."""
-        return (datetime.utcnow() - self.last_activity) > timedelta(minutes=timeout_minutes)
+        return time.monotonic() - self.last_activity > timeout_minutes * 60
     
     def is_substantial(self) -> bool:
         """Check if conversation is substantial enough to log feedback."""
         # At least 3 messages (user + agent + user) or contains important actions
-        return len(self.messages) >= 3 or bool(self.context_tags & {
-            'work_creation', 'publishing', 'replanning'
-        })
+        return self.message_count >= 3 or bool(self.context_tags & _SUBSTANTIAL_TAGS)
     
     def generate_summary(self) -> str:
         """Generate a brief summary of the conversation."""
-        if not self.messages:
+        if not self.message_count:
             return "Empty conversation"
         
-        # Count message types
-        user_messages = sum(1 for role, _, _ in self.messages if role == 'user')
-        agent_messages = sum(1 for role, _, _ in self.messages if role == 'assistant')
-        
         # Extract key topics
         topics = list(self.context_tags) if self.context_tags else ['general query']
         
-        summary = f"{user_messages}-turn conversation about {', '.join(topics)}"
+        summary = f"{self.user_msg_count}-turn conversation about {', '.join(topics)}"
         
-        # Add specifics if present
-        for role, content, _ in self.messages:
-            if role == 'user' and len(content) > 20:
-                # Extract potential work/task names
-                if 'create' in content.lower() or 'new' in content.lower():
-                    summary += f" - initiated via: '{content[:60]}...'"
-                    break
+        # Add specifics if present (potential work/task name)
+        if self.initiated_via:
+            summary += f" - initiated via: '{self.initiated_via[:60]}...'"
         
         return summary
     
@@ -89,37 +254,30 @@ class ConversationSession:
         }
         
         # Analyze message patterns
-        if len(self.messages) < 5:
+        if self.message_count < 5:
             analysis['what_went_well'].append("Quick resolution")
         
-        if len(self.messages) > 10:
+        if self.message_count > 10:
             analysis['what_could_improve'].append("Conversation took many turns - could be more efficient")
         
         # Check for repeated questions (agent asking same thing multiple times)
-        agent_questions = [content for role, content, _ in self.messages 
-                          if role == 'assistant' and '?' in content]
-        if len(agent_questions) > len(set(agent_questions)):
+        if self.has_repeated_question:
             analysis['what_could_improve'].append("Repeated similar questions - listen better to user responses")
         
         # Check for confirmation patterns
-        confirmations = sum(1 for role, content, _ in self.messages 
-                          if role == 'assistant' and any(word in content.lower() 
-                          for word in ['confirm', 'should i', 'proceed', 'go ahead']))
+        confirmations = self.confirmation_count
         if confirmations > 3:
             analysis['what_could_improve'].append(f"Asked {confirmations} confirmations - could combine related confirmations")
         elif confirmations <= 2:
             analysis['what_went_well'].append("Appropriate number of confirmations")
         
         # Check for work creation success
-        if 'work_creation' in self.context_tags:
-            if any('created work' in content.lower() or 'work id' in content.lower() 
-                   for _, content, _ in self.messages):
-                analysis['what_went_well'].append("Successfully completed work creation flow")
-                analysis['user_satisfaction'] = 'High'
+        if 'work_creation' in self.context_tags and self.work_created_marker:
+            analysis['what_went_well'].append("Successfully completed work creation flow")
+            analysis['user_satisfaction'] = 'High'
         
         # Check for errors or confusion
-        if any(word in ' '.join(content for _, content, _ in self.messages).lower() 
-               for word in ['error', 'failed', "don't understand", 'confused']):
+        if self.has_error_marker:
             analysis['what_could_improve'].append("Encountered errors or user confusion")
             analysis['user_satisfaction'] = 'Low'
         
@@ -134,8 +292,42 @@ class ConversationSession:
         }
 
 
+# agent_api (and the DB layer behind it), imported on first feedback write
+_agent_api = None
+
+
+def _get_agent_api():
+    """Import agent_api once and cache the module reference."""
+    global _agent_api
+    if _agent_api is None:
+        import agent_api
+        _agent_api = agent_api
+    return _agent_api
+
+
+# Number of independently locked session partitions (power of two)
+SHARD_COUNT = 16
+# Upper bound on sessions expired by one cleanup pass; the rest wait for the next pass
+MAX_EXPIRIES_PER_PASS = 100
+# Seconds shutdown waits for queued feedback writes to finish
+FEEDBACK_DRAIN_TIMEOUT = 5.0
+# Feedback worker batching: wait up to FEEDBACK_BATCH_WINDOW seconds for more ended
+# sessions after the first, writing at most FEEDBACK_BATCH_SIZE per call
+FEEDBACK_BATCH_WINDOW = 0.05
+FEEDBACK_BATCH_SIZE = 32
+
+
 class SessionTracker:
-    """Tracks multiple conversation sessions and logs feedback automatically."""
+    """Tracks multiple conversation sessions and logs feedback automatically.
+    
+    Sessions are partitioned into SHARD_COUNT shards, each with its own lock, so
+    tracking a message only contends with sessions hashing to the same shard.
+    """
+    
+    __slots__ = (
+        '_shards', '_expiry_heap', '_expiry_lock', 'inactivity_timeout', '_inactivity_seconds',
+        'check_interval', '_stop_evt', 'cleanup_thread', '_feedback_q', '_feedback_worker',
+    )
     
     def __init__(self, inactivity_timeout: int = 10, check_interval: int = 60):
         """Initialize session tracker.
@@ -144,20 +336,63 @@ class SessionTracker:
             inactivity_timeout: Minutes of inactivity before session considered ended
             check_interval: Seconds between session cleanup checks
         """
-        self.sessions: Dict[str, ConversationSession] = {}
-        self.lock = Lock()
+        self._shards: List[Tuple[Lock, Dict[str, ConversationSession]]] = [
+            (Lock(), {}) for _ in range(SHARD_COUNT)
+        ]
+        # Min-heap of (inactivity deadline, session_id), one entry per live session, so
+        # cleanup only looks at sessions that are due instead of scanning them all
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._expiry_lock = Lock()
         self.inactivity_timeout = inactivity_timeout
+        self._inactivity_seconds = inactivity_timeout * 60
         self.check_interval = check_interval
-        self.running = True
+        # Set on shutdown; also wakes the cleanup thread out of its wait
+        self._stop_evt = Event()
         
         # Start background cleanup thread
         self.cleanup_thread = Thread(target=self._cleanup_loop, daemon=True)
         self.cleanup_thread.start()
         
+        # Ended sessions are summarized and written by a single feedback worker so
+        # end_session never blocks on the feedback DB
+        self._feedback_q: queue.Queue = queue.Queue()
+        self._feedback_worker = Thread(target=self._drain, daemon=True)
+        self._feedback_worker.start()
+        
         # Register cleanup on exit
         atexit.register(self.shutdown)
         
-        logger.info(f"SessionTracker initialized (timeout={inactivity_timeout}min, check_interval={check_interval}s)")
+        logger.info("SessionTracker initialized (timeout=%smin, check_interval=%ss)", inactivity_timeout, check_interval)
+    
+    def _shard(self, session_id: str) -> Tuple[Lock, Dict[str, ConversationSession]]:
+        """Return the (lock, sessions) shard that owns session_id."""
+        return self._shards[hash(session_id) & (SHARD_COUNT - 1)]
+    
+    def _schedule_expiry(self, session_id: str, deadline: float):
+        """Queue a session's inactivity deadline (time.monotonic() based)."""
+        with self._expiry_lock:
+            heapq.heappush(self._expiry_heap, (deadline, session_id))
+    
+    def _new_session(self, sessions: Dict[str, ConversationSession], session_id: str) -> ConversationSession:
+        """Create a session in its shard (caller holds the shard lock) and queue its expiry."""
+        session = sessions[session_id] = ConversationSession(session_id)
+        self._schedule_expiry(session_id, session.last_activity + self._inactivity_seconds)
+        logger.info("Started tracking session: %s", session_id)
+        return session
+    
+    @property
+    def running(self) -> bool:
+        """Whether the tracker is running (shutdown not yet requested)."""
+        return not self._stop_evt.is_set()
+    
+    @property
+    def sessions(self) -> Dict[str, ConversationSession]:
+        """Snapshot of all tracked sessions across shards."""
+        merged = {}
+        for lock, sessions in self._shards:
+            with lock:
+                merged.update(sessions)
+        return merged
     
     def track_message(self, session_id: str, role: str, content: str):
         """Track a message in a conversation session.
@@ -167,12 +402,28 @@ class SessionTracker:
             role: Message role ('user' or 'assistant')
             content: Message content
         """
-        with self.lock:
-            if session_id not in self.sessions:
-                self.sessions[session_id] = ConversationSession(session_id)
-                logger.info(f"Started tracking session: {session_id}")
-            
-            self.sessions[session_id].add_message(role, content)
+        lock, sessions = self._shard(session_id)
+        with lock:
+            session = sessions.get(session_id) or self._new_session(sessions, session_id)
+            session.add_message(role, content)
+    
+    def track_messages(self, messages: List[Tuple[str, str, str]]):
+        """Track a batch of messages with one lock acquisition per shard.
+        
+        Args:
+            messages: (session_id, role, content) tuples, in arrival order
+        """
+        # Group by shard; a session always maps to one shard, so its order is kept
+        by_shard: Dict[int, List[Tuple[str, str, str]]] = {}
+        for message in messages:
+            by_shard.setdefault(hash(message[0]) & (SHARD_COUNT - 1), []).append(message)
+        
+        for index, shard_messages in by_shard.items():
+            lock, sessions = self._shards[index]
+            with lock:
+                for session_id, role, content in shard_messages:
+                    session = sessions.get(session_id) or self._new_session(sessions, session_id)
+                    session.add_message(role, content)
     
     def end_session(self, session_id: str, explicit: bool = True):
         """End a session and log feedback.
@@ -181,83 +432,161 @@ class SessionTracker:
             session_id: Session to end
             explicit: Whether session was explicitly ended or timed out
         """
-        with self.lock:
-            if session_id not in self.sessions:
-                return
-            
-            session = self.sessions[session_id]
-            
-            if session.completed:
-                return  # Already logged
+        # Only the dict removal happens under the shard lock; summarizing and the
+        # feedback DB write are left to the feedback worker
+        lock, sessions = self._shard(session_id)
+        with lock:
+            session = sessions.pop(session_id, None)
+            if session is None or session.completed:
+                return  # Unknown or already logged
+            session.completed = True
+        
+        self._finalize(session, explicit)
+    
+    def _finalize(self, session: ConversationSession, explicit: bool):
+        """Hand an ended session (already removed from its shard) to the feedback worker."""
+        self._feedback_q.put((session, explicit))
+    
+    def _drain(self):
+        """Feedback worker: log feedback for ended sessions in small batches.
+        
+        After the first queued session arrives, more are collected for up to
+        FEEDBACK_BATCH_WINDOW seconds (or FEEDBACK_BATCH_SIZE sessions) so a burst
+        of endings is written with one database round-trip.
+        """
+        while True:
+            batch = [self._feedback_q.get()]
+            deadline = time.monotonic() + FEEDBACK_BATCH_WINDOW
+            try:
+                while len(batch) < FEEDBACK_BATCH_SIZE:
+                    batch.append(self._feedback_q.get(timeout=max(deadline - time.monotonic(), 0)))
+            except queue.Empty:
+                pass
             
+            try:
+                self._log_feedback(batch)
+            except Exception as e:
+                logger.exception("Error logging feedback for %s sessions: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._feedback_q.task_done()
+    
+    def _log_feedback(self, batch: List[Tuple[ConversationSession, bool]]):
+        """Summarize ended sessions and record their feedback."""
+        ended = []
+        payloads = []
+        for session, explicit in batch:
             # Only log if substantial
             if not session.is_substantial():
-                logger.debug(f"Session {session_id} not substantial enough to log feedback")
-                del self.sessions[session_id]
-                return
+                logger.debug("Session %s not substantial enough to log feedback", session.session_id)
+                continue
             
             # Generate feedback
-            summary = session.generate_summary()
             analysis = session.analyze_quality()
+            ended.append((session.session_id, explicit))
+            payloads.append({
+                'conversation_summary': session.generate_summary(),
+                'what_went_well': analysis['what_went_well'],
+                'what_could_improve': analysis['what_could_improve'],
+                'user_satisfaction': analysis['user_satisfaction'],
+                'tags': list(session.context_tags),
+            })
+        
+        if not payloads:
+            return
+        
+        # Log the feedback, one write for the whole batch
+        feedback_ids = _get_agent_api().record_conversation_feedback_bulk(payloads)
+        
+        for (session_id, explicit), feedback_id in zip(ended, feedback_ids):
+            if feedback_id:
+                logger.info("Logged feedback for session %s: feedback_id=%s (%s)",
+                            session_id, feedback_id, 'explicit' if explicit else 'timeout')
+            else:
+                logger.warning("Failed to log feedback for session %s", session_id)
+    
+    def flush_feedback(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued feedback writes to finish.
+        
+        Args:
+            timeout: Maximum seconds to wait (None waits indefinitely)
             
-            # Log the feedback
-            try:
-                import agent_api
-                
-                feedback_id = agent_api.record_conversation_feedback(
-                    conversation_summary=summary,
-                    what_went_well=analysis['what_went_well'],
-                    what_could_improve=analysis['what_could_improve'],
-                    user_satisfaction=analysis['user_satisfaction'],
-                    tags=list(session.context_tags)
-                )
-                
-                if feedback_id:
-                    logger.info(f"Logged feedback for session {session_id}: feedback_id={feedback_id} "
-                              f"({'explicit' if explicit else 'timeout'})")
-                else:
-                    logger.warning(f"Failed to log feedback for session {session_id}")
-                
-            except Exception as e:
-                logger.exception(f"Error logging feedback for session {session_id}: {e}")
-            
-            # Mark as completed and remove
-            session.completed = True
-            del self.sessions[session_id]
+        Returns:
+            True if the queue was drained, False if the timeout expired first
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._feedback_q.all_tasks_done:
+            while self._feedback_q.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._feedback_q.all_tasks_done.wait(remaining)
+        return True
     
     def _cleanup_loop(self):
         """Background thread that checks for inactive sessions."""
-        while self.running:
+        while not self._stop_evt.wait(self._next_cleanup_delay()):
             try:
-                time.sleep(self.check_interval)
                 self._cleanup_inactive_sessions()
             except Exception as e:
-                logger.exception(f"Error in session cleanup loop: {e}")
+                logger.exception("Error in session cleanup loop: %s", e)
+    
+    def _next_cleanup_delay(self) -> float:
+        """Seconds until the earliest queued deadline, capped at check_interval."""
+        with self._expiry_lock:
+            if not self._expiry_heap:
+                return self.check_interval
+            until_due = self._expiry_heap[0][0] - time.monotonic()
+        return min(self.check_interval, max(until_due, 0))
     
     def _cleanup_inactive_sessions(self):
-        """Check for and clean up inactive sessions."""
-        with self.lock:
-            inactive_sessions = [
-                session_id for session_id, session in self.sessions.items()
-                if session.is_inactive(self.inactivity_timeout) and not session.completed
-            ]
-        
-        for session_id in inactive_sessions:
-            logger.info(f"Session {session_id} inactive for {self.inactivity_timeout} minutes, ending...")
-            self.end_session(session_id, explicit=False)
+        """End sessions whose inactivity deadline has passed.
+        
+        Only due heap entries are examined. A session that saw activity since its
+        entry was queued is re-queued at its new deadline instead of ended.
+        """
+        now = time.monotonic()
+        inactive_sessions = []
+        for _ in range(MAX_EXPIRIES_PER_PASS):
+            with self._expiry_lock:
+                if not self._expiry_heap or self._expiry_heap[0][0] > now:
+                    break
+                _, session_id = heapq.heappop(self._expiry_heap)
+            
+            lock, sessions = self._shard(session_id)
+            with lock:
+                session = sessions.get(session_id)
+                if session is None or session.completed:
+                    continue
+                deadline = session.last_activity + self._inactivity_seconds
+                if deadline > now:
+                    self._schedule_expiry(session_id, deadline)
+                    continue
+                # Pop while the lock is held so ending it needs no second acquisition
+                del sessions[session_id]
+                session.completed = True
+            inactive_sessions.append(session)
+        
+        for session in inactive_sessions:
+            logger.info("Session %s inactive for %s minutes, ending...", session.session_id, self.inactivity_timeout)
+            self._finalize(session, explicit=False)
     
     def shutdown(self):
         """Shutdown tracker and log feedback for all active sessions."""
         logger.info("Shutting down SessionTracker...")
-        self.running = False
+        self._stop_evt.set()
+        self.cleanup_thread.join(timeout=5)
         
         # End all active sessions
-        with self.lock:
-            session_ids = list(self.sessions.keys())
+        session_ids = list(self.sessions)
         
         for session_id in session_ids:
             self.end_session(session_id, explicit=False)
         
+        if not self.flush_feedback(FEEDBACK_DRAIN_TIMEOUT):
+            logger.warning("Feedback queue not drained within %ss; %s pending",
+                           FEEDBACK_DRAIN_TIMEOUT, self._feedback_q.qsize())
+        
         logger.info("SessionTracker shutdown complete")
 
 
@@ -4,23 +4,78 @@ Refactored to use agent_api facade for clean, agent-friendly operations.
 Each tool delegates to agent_api functions with minimal logic.
 """
 from typing import Any, Dict, List, Optional
+import asyncio
+import functools
 import logging
-from datetime import datetime
-import sys
-from pathlib import Path
-
-# Add project root to Python path
-project_root = Path(__file__).parent.parent.parent
-if str(project_root) not in sys.path:
-    sys.path.insert(0, str(project_root))
+import re
+from datetime import datetime, timezone
+from types import MappingProxyType
 
 from generate import generate_subtasks
 import agent_api
+from core.storage import (
+    create_task,
+    get_task_by_id,
+    get_work_by_id,
+    list_tasks,
+    update_task_status,
+    update_work_status,
+)
+from core.task import TaskStatus
+from core.work import WorkStatus
+from core.slack import get_notifier
+from core.feedback import get_recent_feedback
+from .notify_queue import get_notification_queue
+from .read_cache import invalidates, on_write, ttl_cache
+from .upcoming_events import get_upcoming_events_cache
 
 logger = logging.getLogger('agent.tools')
 
+# Mutating tools can change Google Tasks, so the next upcoming-events read fetches live
+on_write(get_upcoming_events_cache().mark_stale)
+
+# tool_refine_subtasks feedback patterns
+_REMOVE_RE = re.compile(r'remove (\d+)')
+_ADD_SPLIT_RE = re.compile(r'[;\n]')
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_due(value: Optional[str]) -> Optional[datetime]:
+    """Parse an ISO-8601 due date/datetime from a tool argument.
+    
+    A trailing 'Z' is accepted, and offset-aware values are converted to naive UTC
+    (how due dates are stored). Cached, since retried tool calls repeat the same strings.
+    
+    Returns:
+        Parsed datetime, or None for None/empty input
+        
+    Raises:
+        ValueError: If value is not a valid ISO date/datetime
+    """
+    if not value:
+        return None
+    if value.endswith(('Z', 'z')):
+        value = value[:-1] + '+00:00'
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+# celery_app (and the Celery/broker setup behind it), imported on first queued task
+_celery_app = None
+
+
+def _get_celery_app():
+    """Import celery_app once and cache the module reference."""
+    global _celery_app
+    if _celery_app is None:
+        import celery_app
+        _celery_app = celery_app
+    return _celery_app
+
 
-def tool_generate_subtasks(task_description: str, max_subtasks: int = 4) -> Dict[str, Any]:
+async def tool_generate_subtasks(task_description: str, max_subtasks: int = 4) -> Dict[str, Any]:
     """
     Generate subtasks for a given task description.
     Args:
@@ -33,7 +88,9 @@ def tool_generate_subtasks(task_description: str, max_subtasks: int = 4) -> Dict
             "subtasks": ["Collect data", "Analyze trends", ...]
         }
     """
-    res = generate_subtasks(task_description, max_subtasks=max_subtasks)
+    # Blocking OpenAI call + parse run in a worker thread so the agent's event loop
+    # keeps serving other sessions meanwhile
+    res = await asyncio.to_thread(generate_subtasks, task_description, max_subtasks=max_subtasks)
     return res
 
 
@@ -51,9 +108,8 @@ def tool_refine_subtasks(original_subtasks: List[str], feedback: str) -> Dict[st
     """
     refined = list(original_subtasks)
     fb = feedback.lower()
-    import re
     # Remove pattern: 'remove 2' (1-based index)
-    for rem_match in re.findall(r'remove (\d+)', fb):
+    for rem_match in _REMOVE_RE.findall(fb):
         try:
             idx = int(rem_match) - 1
             if 0 <= idx < len(refined):
@@ -63,7 +119,7 @@ def tool_refine_subtasks(original_subtasks: List[str], feedback: str) -> Dict[st
     # Add pattern: lines after 'add:' separated by ';' or newlines
     if 'add:' in fb:
         add_part = feedback.split('add:')[1]
-        candidates = re.split(r'[;\n]', add_part)
+        candidates = _ADD_SPLIT_RE.split(add_part)
         for c in candidates:
             title = c.strip().strip('-').strip()
             if title:
@@ -80,7 +136,8 @@ def tool_refine_subtasks(original_subtasks: List[str], feedback: str) -> Dict[st
     return {"refined_subtasks": refined}
 
 
-def tool_create_work(title: str, description: str = '', tasks: List[Dict[str, str]] = [], status: str = 'Draft', expected_completion_hint: Optional[str] = None) -> Dict[str, Any]:
+@invalidates
+def tool_create_work(title: str, description: str = '', tasks: Optional[List[Dict[str, str]]] = None, status: str = 'Draft', expected_completion_hint: Optional[str] = None) -> Dict[str, Any]:
     """Create work item with optional tasks.
     
     Note: Due dates are NOT automatically assigned. After creation, use tool_propose_due_dates
@@ -96,12 +153,15 @@ def tool_create_work(title: str, description: str = '', tasks: List[Dict[str, st
     Returns:
         {"id": work_id, "title": work_title}
     """
+    if tasks is None:
+        tasks = ()
     work_id = agent_api.create_work_with_tasks(title, description, tasks, False, expected_completion_hint)
     if work_id:
         return {'id': work_id, 'title': title}
     return {'error': 'failed to create work'}
 
 
+@invalidates
 def tool_create_task(work_id: int, title: str, status: str = 'Draft', due_date: Optional[str] = None) -> Dict[str, Any]:
     """Create a single task under an existing work.
     
@@ -114,15 +174,10 @@ def tool_create_task(work_id: int, title: str, status: str = 'Draft', due_date:
     Returns:
         {"task_id": id, "title": title, "status": status, "due_date": date_str}
     """
-    from core.storage import create_task
-    from core.task import TaskStatus
-    
-    parsed_due = None
-    if due_date:
-        try:
-            parsed_due = datetime.fromisoformat(due_date)
-        except Exception:
-            pass
+    try:
+        parsed_due = _parse_due(due_date)
+    except ValueError:
+        return {"error": "invalid ISO date"}
     
     task_status = TaskStatus.from_string(status)
     task = create_task(work_id, title, task_status, parsed_due)
@@ -137,6 +192,7 @@ def tool_create_task(work_id: int, title: str, status: str = 'Draft', due_date:
     return {'error': 'failed to create task'}
 
 
+@invalidates
 def tool_publish_work(work_id: int, schedule_first_task: bool = True) -> Dict[str, Any]:
     """Publish a work item and send notifications.
     
@@ -150,16 +206,11 @@ def tool_publish_work(work_id: int, schedule_first_task: bool = True) -> Dict[st
     Returns:
         {"published": True, "work_id": id} or {"error": "...", "tasks_without_dates": [...]}
     """
-    from core.storage import get_work_by_id, list_tasks
-    
     # Validate all tasks have due dates
-    work = get_work_by_id(work_id, include_tasks=True)
-    if not work:
+    tasks_without_dates = agent_api.tasks_missing_due_dates(work_id)
+    if tasks_without_dates is None:
         return {'error': 'work not found'}
     
-    tasks = list_tasks(work_id=work_id, exclude_completed=True)
-    tasks_without_dates = [t.id for t in tasks if not t.due_date]
-    
     if tasks_without_dates:
         return {
             'error': 'cannot publish: some tasks missing due dates',
@@ -188,6 +239,7 @@ def tool_send_due_date_confirmation(work_id: int) -> Dict[str, Any]:
     return {"error": "failed to send confirmation"}
 
 
+@invalidates
 def tool_schedule_first_untracked_task(work_id: int) -> Dict[str, Any]:
     """Schedule the first incomplete task for a work.
     
@@ -197,9 +249,6 @@ def tool_schedule_first_untracked_task(work_id: int) -> Dict[str, Any]:
     Returns:
         {"scheduled_task_id": id}
     """
-    from core.storage import list_tasks, update_task_status
-    from core.task import TaskStatus
-    
     tasks = list_tasks(work_id=work_id, exclude_completed=True)
     if not tasks:
         return {"error": "no schedulable task"}
@@ -213,6 +262,7 @@ def tool_schedule_first_untracked_task(work_id: int) -> Dict[str, Any]:
     return {"error": "failed to schedule task"}
 
 
+@invalidates
 def tool_update_task_status(task_id: int, status: str) -> Dict[str, Any]:
     """Update task status.
     
@@ -223,9 +273,6 @@ def tool_update_task_status(task_id: int, status: str) -> Dict[str, Any]:
     Returns:
         {"task_id": id, "status": status}
     """
-    from core.storage import update_task_status
-    from core.task import TaskStatus
-    
     task_status = TaskStatus.from_string(status)
     task = update_task_status(task_id, task_status)
     
@@ -234,6 +281,7 @@ def tool_update_task_status(task_id: int, status: str) -> Dict[str, Any]:
     return {"error": "task not found"}
 
 
+@invalidates
 def tool_complete_task_and_schedule_next(task_id: int) -> Dict[str, Any]:
     """Complete a task and schedule the next pending one if any.
     
@@ -243,19 +291,13 @@ def tool_complete_task_and_schedule_next(task_id: int) -> Dict[str, Any]:
     Returns:
         {"completed_task_id": id, "work_id": work_id}
     """
-    from core.storage import get_task_by_id
-    
-    task = get_task_by_id(task_id)
-    if not task:
-        return {"error": "task not found"}
-    
-    result = agent_api.complete_task_flow(task_id)
-    if result:
+    task = agent_api.complete_task_flow(task_id)
+    if task:
         return {"completed_task_id": task_id, "work_id": task.work_id}
     return {"error": "failed to complete task"}
 
 
-def tool_propose_due_dates(work_id: int, expected_completion_hint: Optional[str] = None) -> Dict[str, Any]:
+async def tool_propose_due_dates(work_id: int, expected_completion_hint: Optional[str] = None) -> Dict[str, Any]:
     """Generate AI-proposed due dates for tasks (does NOT persist them).
     
     Uses LLM to analyze task difficulty and propose realistic due dates.
@@ -272,7 +314,8 @@ def tool_propose_due_dates(work_id: int, expected_completion_hint: Optional[str]
             "schedule_map": {task_id: "YYYY-MM-DD", ...}  # Use this for tool_confirm_due_dates
         }
     """
-    result = agent_api.propose_due_dates_for_work(work_id, expected_completion_hint)
+    # LLM scheduling call is blocking; keep it off the event loop
+    result = await asyncio.to_thread(agent_api.propose_due_dates_for_work, work_id, expected_completion_hint)
     if result:
         # Add schedule_map for easy confirmation
         if 'schedule' in result:
@@ -282,6 +325,7 @@ def tool_propose_due_dates(work_id: int, expected_completion_hint: Optional[str]
     return {"error": "failed to propose due dates"}
 
 
+@invalidates
 def tool_confirm_due_dates(work_id: int, schedule: Dict[int, str]) -> Dict[str, Any]:
     """Apply user-confirmed due dates to tasks.
     
@@ -303,6 +347,7 @@ def tool_confirm_due_dates(work_id: int, schedule: Dict[int, str]) -> Dict[str,
     return {"error": "failed to confirm due dates"}
 
 
+@invalidates
 def tool_snooze_task(task_id: int, days: int = 1) -> Dict[str, Any]:
     """Snooze a task by moving its due date forward.
     
@@ -313,19 +358,17 @@ def tool_snooze_task(task_id: int, days: int = 1) -> Dict[str, Any]:
     Returns:
         {"task_id": id, "snoozed_days": days, "snooze_count": count}
     """
-    from core.storage import get_task_by_id
-    
-    result = agent_api.snooze_task(task_id, days)
-    if result:
-        task = get_task_by_id(task_id)
+    task = agent_api.snooze_task(task_id, days)
+    if task:
         return {
             "task_id": task_id,
             "snoozed_days": days,
-            "snooze_count": task.snooze_count if task else 0
+            "snooze_count": task.snooze_count
         }
     return {"error": "failed to snooze task"}
 
 
+@invalidates
 def tool_reschedule_task_event(task_id: int, new_due: str) -> Dict[str, Any]:
     """Reschedule a task to a new due datetime.
     
@@ -336,19 +379,18 @@ def tool_reschedule_task_event(task_id: int, new_due: str) -> Dict[str, Any]:
     Returns:
         {"task_id": id, "new_due": date_str}
     """
-    from core.storage import get_task_by_id
-    
     try:
-        parsed_due = datetime.fromisoformat(new_due)
-    except Exception:
-        return {"error": "invalid new_due format"}
+        parsed_due = _parse_due(new_due)
+    except ValueError:
+        return {"error": "invalid ISO date"}
+    if parsed_due is None:
+        return {"error": "invalid ISO date"}
     
-    result = agent_api.set_task_due_date(task_id, parsed_due, source="reschedule")
-    if result:
-        task = get_task_by_id(task_id)
+    task = agent_api.set_task_due_date(task_id, parsed_due, source="reschedule")
+    if task:
         return {
             "task_id": task_id,
-            "new_due": task.due_date.isoformat() if task and task.due_date else new_due
+            "new_due": task.due_date.isoformat() if task.due_date else new_due
         }
     return {"error": "failed to reschedule task"}
 
@@ -360,16 +402,17 @@ def tool_list_upcoming_events(max_results: int = 10) -> Dict[str, Any]:
         max_results: Maximum number of tasks to return
         
     Returns:
-        {"upcoming": [task_dicts]}
+        {"upcoming": [task_dicts], "as_of": ISO time the tasks were fetched (UTC)}
     """
     try:
-        events = agent_api.fetch_calendar_tasks()
-        return {"upcoming": events[:max_results]}
+        events, as_of = get_upcoming_events_cache().get()
+        return {"upcoming": events[:max_results], "as_of": as_of.isoformat()}
     except Exception as e:
         logger.exception('Failed to list upcoming events')
         return {"error": str(e)}
 
 
+@invalidates
 def tool_sync_event_update(task_id: int) -> Dict[str, Any]:
     """Sync a task's state from Google Tasks.
     
@@ -386,74 +429,65 @@ def tool_sync_event_update(task_id: int) -> Dict[str, Any]:
 
 
 def tool_notify_task_completed(task_id: int) -> Dict[str, Any]:
-    """Send notification that a task was completed.
+    """Queue notification that a task was completed (sent with the turn's other notifications).
     
     Args:
         task_id: Task ID
         
     Returns:
-        {"sent": True/False}
+        {"queued": True/False}
     """
-    from core.storage import get_task_by_id, get_work_by_id
-    from core.slack import get_notifier
-    
     task = get_task_by_id(task_id)
     if not task:
         return {"error": "task not found"}
     
     work = get_work_by_id(task.work_id, include_tasks=False)
     if work:
-        notifier = get_notifier()
-        result = notifier.send_task_completed(task, work)
-        return {"sent": result}
+        get_notification_queue().add_message(get_notifier().format_task_completed(task, work))
+        return {"queued": True}
     
-    return {"sent": False}
+    return {"queued": False}
 
 
 def tool_notify_work_completed(work_id: int) -> Dict[str, Any]:
-    """Send notification that a work was completed.
+    """Queue notification that a work was completed (sent with the turn's other notifications).
     
     Args:
         work_id: Work ID
         
     Returns:
-        {"sent": True/False}
+        {"queued": True}
     """
-    from core.storage import get_work_by_id
-    from core.slack import get_notifier
-    
     work = get_work_by_id(work_id, include_tasks=True)
     if not work:
         return {"error": "work not found"}
     
-    notifier = get_notifier()
-    result = notifier.send_work_completed(work)
-    return {"sent": result}
+    get_notification_queue().add_message(get_notifier().format_work_completed(work))
+    return {"queued": True}
 
 
 def tool_grouped_work_alert(work_id: int, changes: List[str]) -> Dict[str, Any]:
-    """Send grouped notification for multiple changes to a work.
+    """Queue grouped notification for multiple changes to a work.
+    
+    Alerts queued for the same work within a turn are merged into one message.
     
     Args:
         work_id: Work ID
         changes: List of change descriptions
         
     Returns:
-        {"work_id": id, "changes_count": count}
+        {"work_id": id, "changes_count": count, "queued": True}
     """
-    from core.storage import get_work_by_id
-    from core.slack import get_notifier
-    
     work = get_work_by_id(work_id, include_tasks=False)
     if not work:
         return {"error": "work not found"}
     
-    notifier = get_notifier()
-    notifier.send_grouped_alert(work, changes)
+    get_notification_queue().add_changes(work.id, work.title, changes)
     
-    return {"work_id": work_id, "changes_count": len(changes)}
+    return {"work_id": work_id, "changes_count": len(changes), "queued": True}
 
 
+@invalidates
 def tool_complete_work(work_id: int) -> Dict[str, Any]:
     """Mark a work item as completed.
     
@@ -463,9 +497,6 @@ def tool_complete_work(work_id: int) -> Dict[str, Any]:
     Returns:
         {"work_id": id, "status": status}
     """
-    from core.storage import update_work_status
-    from core.work import WorkStatus
-    
     work = update_work_status(work_id, WorkStatus.COMPLETED)
     if work:
         return {"work_id": work.id, "status": work.status}
@@ -489,6 +520,7 @@ def tool_daily_planner_digest() -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+@ttl_cache()
 def tool_get_weekly_status() -> Dict[str, Any]:
     """Get current week's task status and summary.
     
@@ -514,6 +546,7 @@ def tool_get_weekly_status() -> Dict[str, Any]:
         return {"error": str(e)}
 
 
+@ttl_cache()
 def tool_get_work(work_id: int) -> Dict[str, Any]:
     """Get detailed information about a work item.
     
@@ -529,6 +562,7 @@ def tool_get_work(work_id: int) -> Dict[str, Any]:
     return {'error': 'work not found'}
 
 
+@ttl_cache()
 def tool_list_works(status: str = 'all') -> Dict[str, Any]:
     """List work items by status.
     
@@ -542,6 +576,7 @@ def tool_list_works(status: str = 'all') -> Dict[str, Any]:
     return {"works": works}
 
 
+@ttl_cache()
 def tool_list_tasks(status: str = 'all', work_id: Optional[int] = None) -> Dict[str, Any]:
     """List tasks by status.
     
@@ -556,6 +591,7 @@ def tool_list_tasks(status: str = 'all', work_id: Optional[int] = None) -> Dict[
     return {"tasks": tasks}
 
 
+@ttl_cache()
 def tool_get_today_tasks() -> Dict[str, Any]:
     """Get all tasks due today for display to user.
     
@@ -569,6 +605,7 @@ def tool_get_today_tasks() -> Dict[str, Any]:
     return {"tasks": tasks}
 
 
+@ttl_cache()
 def tool_get_overdue_tasks() -> Dict[str, Any]:
     """Get all overdue tasks for display to user.
     
@@ -583,18 +620,32 @@ def tool_get_overdue_tasks() -> Dict[str, Any]:
 
 
 def tool_send_slack_message(text: str) -> Dict[str, Any]:
-    """Send a Slack notification message.
+    """Queue a Slack notification message (sent with the turn's other notifications).
     
     Args:
         text: Message text
         
     Returns:
-        {"sent": True}
+        {"queued": True}
     """
-    result = agent_api.send_slack_notification(text)
-    return {'sent': result}
+    get_notification_queue().add_message(text)
+    return {'queued': True}
 
 
+def tool_flush_notifications() -> Dict[str, Any]:
+    """Send all queued Slack notifications now, as one message.
+    
+    Queued notifications are also sent automatically at the end of each turn.
+    
+    Returns:
+        {"sent": True/False, "count": number_of_notifications}
+    """
+    queue = get_notification_queue()
+    count = queue.pending_count()
+    return {'sent': queue.flush(), 'count': count}
+
+
+@invalidates
 def tool_schedule_task_to_calendar(task_id: int) -> Dict[str, Any]:
     """Schedule a task to Google Tasks.
     
@@ -620,26 +671,35 @@ def tool_queue_celery_task(task_id: int) -> Dict[str, Any]:
         {"queued": True, "task_id": id}
     """
     try:
-        from celery_app import async_assign_task
-        from core.storage import get_task_by_id
-        
-        task = get_task_by_id(task_id)
-        if not task:
-            return {'error': 'task not found'}
-        
-        payload = {
-            "id": task.id,
-            "title": task.title,
-            "status": task.status,
-            "due_date": task.due_date.isoformat() if task.due_date else None
-        }
-        async_assign_task.delay(payload)
-        return {'queued': True, 'task_id': task.id}
+        # The worker loads the task itself; enqueueing is just the broker publish
+        _get_celery_app().async_assign_task.delay({'task_id': task_id})
+        return {'queued': True, 'task_id': task_id}
     except Exception as e:
         logger.exception('Failed to queue celery task')
         return {'error': str(e)}
 
 
+def tool_queue_celery_tasks(task_ids: List[int]) -> Dict[str, Any]:
+    """Queue several tasks for asynchronous processing in one batch.
+    
+    Prefer this over repeated queue_celery_task calls: all tasks are published
+    over a single broker connection.
+    
+    Args:
+        task_ids: Task IDs
+        
+    Returns:
+        {"queued": True, "task_ids": [ids]}
+    """
+    try:
+        if not _get_celery_app().enqueue_assign_tasks(task_ids):
+            return {'error': 'task queue unavailable'}
+        return {'queued': True, 'task_ids': list(task_ids)}
+    except Exception as e:
+        logger.exception('Failed to queue celery tasks')
+        return {'error': str(e)}
+
+
 # ===== Learning & Feedback Tools =====
 
 def tool_log_conversation_feedback(
@@ -727,7 +787,6 @@ def tool_generate_behavior_summary(days: int = 7) -> Dict[str, Any]:
     summary_id = agent_api.generate_and_apply_learning_summary(days)
     
     if summary_id:
-        from core.feedback import get_recent_feedback
         recent = get_recent_feedback(days=days)
         return {
             "summary_id": summary_id,
@@ -737,7 +796,7 @@ def tool_generate_behavior_summary(days: int = 7) -> Dict[str, Any]:
     return {"error": "no feedback to analyze or generation failed"}
 
 
-# Registry of tools the agent can call
+# Registry of tools the agent can call (exposed as a read-only view below)
 TOOLS = {
     # Task generation
     'generate_subtasks': tool_generate_subtasks,
@@ -776,12 +835,16 @@ TOOLS = {
     'notify_work_completed': tool_notify_work_completed,
     'grouped_work_alert': tool_grouped_work_alert,
     'daily_planner_digest': tool_daily_planner_digest,
+    'flush_notifications': tool_flush_notifications,
     
     # Celery async
     'queue_celery_task': tool_queue_celery_task,
+    'queue_celery_tasks': tool_queue_celery_tasks,
     
     # Learning & feedback
     'log_conversation_feedback': tool_log_conversation_feedback,
     'get_learning_context': tool_get_learning_context,
     'generate_behavior_summary': tool_generate_behavior_summary,
 }
+
+TOOLS = MappingProxyType(TOOLS)
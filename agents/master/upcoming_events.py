@@ -0,0 +1,115 @@
+"""Background-refreshed snapshot of upcoming Google Tasks for the agent.
+
+The agent often lists upcoming events twice in one conversation (while planning,
+then when answering). Instead of a Google Tasks round-trip per call, a daemon
+thread refreshes a snapshot every REFRESH_INTERVAL seconds; reads fall back to a
+live fetch only when the snapshot is older than MAX_AGE or marked stale.
+"""
+
+import atexit
+import logging
+import time
+from datetime import datetime
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+import agent_api
+
+logger = logging.getLogger(__name__)
+
+REFRESH_INTERVAL = 30.0
+MAX_AGE = 60.0
+
+
+class UpcomingEventsCache:
+    """Thread-safe snapshot of agent_api.fetch_calendar_tasks() with a refresher thread."""
+    
+    def __init__(self, refresh_interval: float = REFRESH_INTERVAL, max_age: float = MAX_AGE):
+        """Initialize the cache (the refresher starts on first read).
+        
+        Args:
+            refresh_interval: Seconds between background refreshes
+            max_age: Oldest snapshot (in seconds) served without a live fetch
+        """
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self._events: List[Dict[str, Any]] = []
+        self._as_of: Optional[datetime] = None
+        # time.monotonic() of the snapshot, None when there is none or it was marked stale
+        self._fetched_at: Optional[float] = None
+        # Bumped by mark_stale so a fetch started before a change doesn't store old data
+        self._generation = 0
+        self._lock = Lock()
+        self._stop_evt = Event()
+        self._thread: Optional[Thread] = None
+    
+    def start(self):
+        """Start the background refresher if it isn't running."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = Thread(target=self._refresh_loop, name='upcoming-events-refresh', daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout: float = 5):
+        """Stop the background refresher.
+        
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._stop_evt.set()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+    
+    def mark_stale(self):
+        """Force the next read to fetch live (call after changing Google Tasks)."""
+        with self._lock:
+            self._generation += 1
+            self._fetched_at = None
+    
+    def refresh(self) -> Tuple[List[Dict[str, Any]], datetime]:
+        """Fetch upcoming tasks from Google Tasks and store them as the snapshot.
+        
+        Returns:
+            (events, as_of) just fetched
+        """
+        with self._lock:
+            generation = self._generation
+        events = agent_api.fetch_calendar_tasks()
+        as_of = datetime.utcnow()
+        with self._lock:
+            if generation == self._generation:
+                self._events, self._as_of, self._fetched_at = events, as_of, time.monotonic()
+        return events, as_of
+    
+    def get(self) -> Tuple[List[Dict[str, Any]], datetime]:
+        """Get upcoming tasks, from the snapshot when it is fresh enough.
+        
+        Returns:
+            (events, as_of) where as_of is when the events were fetched (UTC)
+        """
+        self.start()
+        with self._lock:
+            if self._fetched_at is not None and time.monotonic() - self._fetched_at <= self.max_age:
+                return self._events, self._as_of
+        return self.refresh()
+    
+    def _refresh_loop(self):
+        while not self._stop_evt.wait(self.refresh_interval):
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("Background refresh of upcoming events failed")
+
+
+# Global singleton instance
+_default_cache: Optional[UpcomingEventsCache] = None
+
+
+def get_upcoming_events_cache() -> UpcomingEventsCache:
+    """Get or create the default UpcomingEventsCache (stopped at exit)."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = UpcomingEventsCache()
+        atexit.register(_default_cache.stop)
+    return _default_cache
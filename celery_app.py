@@ -1,39 +1,145 @@
 import os
 import logging
+import time
+import requests
 from celery import Celery
+from celery.signals import worker_process_init
 from datetime import datetime
-from typing import Dict, Any
-from db import get_db, update_task_status, get_work
-from reminder import ReminderAgent
-from contextlib import contextmanager
+from typing import Dict, Any, Iterable, List, Sequence
+from sqlalchemy import update
+from sqlalchemy.orm import joinedload
+from db import Task, Work, SessionLocal, engine
+from core.slack import WEBHOOK_TIMEOUT, get_http_session, get_notifier
+from core.tasks_provider import get_provider
 
 BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
 app = Celery('tasks', broker=BROKER_URL)
 
+# Unacknowledged tasks are redelivered after this long (Redis has no real acks)
+_transport_options = {'visibility_timeout': 3600}
+# Optional key prefix, for sharing a Redis/DragonflyDB instance with other apps
+if os.getenv("CELERY_KEY_PREFIX"):
+    _transport_options['global_keyprefix'] = os.getenv("CELERY_KEY_PREFIX")
+app.conf.update(
+    # Acknowledge after the task finishes, and requeue it if the worker process dies
+    # mid-task, so a crash doesn't silently drop an assignment or notification
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    broker_transport_options=_transport_options,
+    # Enough pooled broker connections for the threaded web/agent processes publishing
+    broker_pool_limit=50,
+)
+
+# After a failed try_publish, skip the broker (callers work inline) for this long
+BROKER_RETRY_INTERVAL = 60.0
+_broker_retry_at = 0.0
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 
-@contextmanager
-def with_db_session():
-    db_gen = get_db()
-    db = next(db_gen)
-    try:
-        yield db
-    finally:
-        db.close()
+@worker_process_init.connect
+def _init_worker_process(**kwargs):
+    # Forked worker processes must not share the parent's pooled connections;
+    # drop the inherited ones (without closing them) so each child opens its own
+    engine.dispose(close=False)
 
-@app.task
+@app.task(ignore_result=True)
 def async_assign_task(task_data: Dict[str, Any]) -> Dict[str, Any]:
     """
     Celery task to assign a task asynchronously, update its status, create calendar event, and send Slack notification.
+    
+    task_data may be just {"task_id": id}; the task is then loaded here, in the worker,
+    instead of by the caller before enqueueing.
+    
+    The status change and work lookup share one transaction; the Slack notification is
+    queued (send_slack_webhook) after it commits, so Slack latency never holds it open.
     """
     try:
-        with with_db_session() as db:
-            agent = ReminderAgent()
-            update_task_status(db, task_data['id'], 'Tracked')
-            work = get_work(db, task_data.get('work_id'))
-            agent.notify_event_created(task_data, work)
-            logging.info(f"Asynchronously assigned and notified for task: {task_data.get('title')} at {datetime.now()}")
-            return task_data
+        with SessionLocal.begin() as db:
+            if 'task_id' in task_data:
+                task = db.get(Task, task_data['task_id'], options=[joinedload(Task.work)])
+                if not task:
+                    logging.warning(f"async_assign_task: task {task_data['task_id']} not found")
+                    return None
+                work = task.work
+                task_data = {
+                    "id": task.id,
+                    "title": task.title,
+                    "status": task.status,
+                    "work_id": task.work_id,
+                    "due_date": task.due_date.isoformat() if task.due_date else None
+                }
+            else:
+                work = db.get(Work, task_data['work_id']) if task_data.get('work_id') else None
+            # Core UPDATE: a single statement, without loading and flushing the ORM object
+            db.execute(update(Task).where(Task.id == task_data['id']).values(status='Tracked'))
+        
+        message = f"Google Task created for Task '{task_data.get('title')}'"
+        if work:
+            message += f" in Work '{work.title}'"
+        get_notifier().send_batch([message + "."], background=True)
+        logging.info(f"Asynchronously assigned and notified for task: {task_data.get('title')} at {datetime.now()}")
+        return task_data
     except Exception as e:
         logging.exception(f"Error in async_assign_task: {e}")
-        raise
\ No newline at end of file
+        raise
+
+
+def try_publish(task, calls: Iterable[Sequence[Any]]) -> bool:
+    """
+    Queue `task` once per args sequence in `calls`, over one producer and failing fast
+    (no reconnect loop or publish retries).
+    
+    Returns False if the broker can't be reached, so the caller can do the work inline;
+    the broker is then skipped for BROKER_RETRY_INTERVAL seconds, so a missing Redis
+    only costs one connection timeout.
+    """
+    global _broker_retry_at
+    if time.monotonic() < _broker_retry_at:
+        return False
+    try:
+        with app.producer_or_acquire() as producer:
+            producer.connection.ensure_connection(max_retries=1)
+            for args in calls:
+                task.apply_async(args=list(args), producer=producer, retry=False)
+    except Exception as e:
+        _broker_retry_at = time.monotonic() + BROKER_RETRY_INTERVAL
+        logging.warning(f"Could not queue {task.name}, falling back to inline: {e}")
+        return False
+    return True
+
+
+def enqueue_assign_tasks(task_ids: Iterable[int]) -> bool:
+    """
+    Queue async_assign_task for several tasks through one producer, so the publishes
+    share a single broker connection and channel instead of one checkout per .delay().
+    
+    Returns False if the broker can't be reached (see try_publish).
+    """
+    return try_publish(async_assign_task, ([{'task_id': task_id}] for task_id in task_ids))
+
+
+@app.task(bind=True, autoretry_for=(requests.Timeout, requests.ConnectionError), retry_backoff=True,
+          max_retries=3, acks_late=True, ignore_result=True)
+def send_slack_webhook(self, url: str, payload: Dict[str, Any]):
+    """
+    Post a Slack webhook payload queued by SlackNotifier.enqueue, retrying timeouts and
+    connection errors with backoff. Uses core.slack's pooled session, so posts handled
+    by one worker process reuse keep-alive connections.
+    """
+    response = get_http_session().post(url, json=payload, timeout=WEBHOOK_TIMEOUT)
+    if response.status_code != 200:
+        logging.error(f"send_slack_webhook: Slack returned {response.status_code} - {response.text}")
+
+
+@app.task(ignore_result=True)
+def sync_task_due_dates(updates: List[List[str]]):
+    """
+    Push new due dates to Google Tasks for tasks rescheduled in bulk.
+    
+    updates is a list of [google_task_id, ISO due datetime] pairs, queued as one job by
+    core.scheduling.reschedule_tasks (through agent_api's dispatcher) after the database was updated.
+    """
+    provider = get_provider()
+    for event_id, due in updates:
+        if not provider.update_task(event_id, due=datetime.fromisoformat(due)):
+            logging.warning(f"sync_task_due_dates: failed to update Google Task {event_id}")
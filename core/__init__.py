@@ -7,6 +7,7 @@ This package provides clean abstractions for:
 - Google Tasks provider integration (tasks_provider.py)
 - Task scheduling and calendar sync (scheduling.py)
 - Due date management and normalization (due_dates.py)
+- Shared LLM completion caching (llm.py)
 """
 
 from .work import WorkStatus
@@ -7,29 +7,35 @@ with conflict resolution and snooze logic.
 import logging
 import os
 import json
+import orjson
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
-from openai import OpenAI
 
 from db import Task
 from .storage import (
     get_task_by_id, update_task_due_date as storage_update_due,
     increment_task_snooze as storage_increment_snooze
 )
-from .scheduling import reschedule_task
+from .scheduling import reschedule_task, reschedule_tasks
 from .slack import get_notifier
+from .llm import CompletionCache, SAMPLING_PARAMS, get_client, get_temperature
 
 load_dotenv()
 logger = logging.getLogger(__name__)
-openai_client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+
+# Same tasks + hint + day produce the same prompt; re-proposing reuses the last schedule
+_schedule_cache = CompletionCache(max_size=64)
+
+# Local and remote due dates closer than this are treated as the same
+_SAME_DUE_TOLERANCE = timedelta(minutes=1)
 
 
 class DueDateManager:
     """Centralized manager for task due dates."""
     
     @staticmethod
-    def set_due_date(task_id: int, new_due: datetime, source: str = "manual") -> bool:
+    def set_due_date(task_id: int, new_due: datetime, source: str = "manual") -> Optional[Task]:
         """Set a task's due date with source tracking.
         
         Args:
@@ -38,13 +44,9 @@ class DueDateManager:
             source: Source of the change (manual, slack, sync, snooze, auto)
             
         Returns:
-            True if set successfully
+            Updated Task object, or None if not found
         """
-        task = get_task_by_id(task_id)
-        if not task:
-            logger.error(f"Task {task_id} not found")
-            return False
-        
+        # reschedule_task looks the task up (and logs if it's missing)
         logger.info(f"Setting due date for task {task_id} to {new_due} (source: {source})")
         
         # Update via scheduling module to sync with calendar
@@ -56,7 +58,7 @@ class DueDateManager:
         return result
     
     @staticmethod
-    def snooze_task(task_id: int, days: int = 1) -> bool:
+    def snooze_task(task_id: int, days: int = 1) -> Optional[Task]:
         """Snooze a task by moving its due date forward.
         
         Increments snooze counter and sends follow-up notification if
@@ -67,12 +69,12 @@ class DueDateManager:
             days: Number of days to snooze
             
         Returns:
-            True if snoozed successfully
+            Updated Task object (with its new snooze_count), or None if not found
         """
         task = get_task_by_id(task_id)
         if not task:
             logger.error(f"Task {task_id} not found")
-            return False
+            return None
         
         # Calculate new due date
         current_due = task.due_date if task.due_date else datetime.utcnow()
@@ -84,13 +86,10 @@ class DueDateManager:
         result = DueDateManager.set_due_date(task_id, new_due, source="snooze")
         
         if not result:
-            return False
+            return None
         
-        # Increment snooze counter
-        storage_increment_snooze(task_id)
-        
-        # Refresh task to get updated snooze_count
-        task = get_task_by_id(task_id)
+        # Increment snooze counter (returns the refreshed task)
+        task = storage_increment_snooze(task_id)
         
         # Send follow-up notification if snoozed multiple times
         if task and task.snooze_count >= 3:
@@ -100,7 +99,7 @@ class DueDateManager:
                 notifier = get_notifier()
                 notifier.send_snooze_followup(task, work)
         
-        return True
+        return task
     
     @staticmethod
     def normalize_due_date(due: datetime) -> datetime:
@@ -149,7 +148,7 @@ class DueDateManager:
             return local_due
         
         # Both exist - check if they differ
-        if abs((local_due - remote_due).total_seconds()) < 60:
+        if abs(local_due - remote_due) < _SAME_DUE_TOLERANCE:
             # Within 1 minute - consider them the same
             return local_due
         
@@ -162,22 +161,32 @@ class DueDateManager:
             return local_due
 
 
+# Global manager instance
+_default_manager: Optional[DueDateManager] = None
+
+
+def get_due_date_manager() -> DueDateManager:
+    """Get or create the default DueDateManager instance."""
+    global _default_manager
+    if _default_manager is None:
+        _default_manager = DueDateManager()
+    return _default_manager
+
+
 def bulk_set_due_dates(task_due_map: dict) -> dict:
     """Set due dates for multiple tasks at once.
     
+    Writes all due dates in one batched UPDATE instead of a lookup and
+    update round-trip per task.
+    
     Args:
         task_due_map: Dict mapping task_id -> datetime
         
     Returns:
         Dict mapping task_id -> success boolean
     """
-    results = {}
-    manager = DueDateManager()
-    
-    for task_id, due_date in task_due_map.items():
-        results[task_id] = manager.set_due_date(task_id, due_date, source="bulk")
-    
-    return results
+    logger.info(f"Setting due dates for {len(task_due_map)} tasks (source: bulk)")
+    return reschedule_tasks(task_due_map)
 
 
 
@@ -241,15 +250,24 @@ def llm_assign_due_dates(tasks: List[Task], expected_completion_hint: Optional[s
             {"role": "user", "content": user_prompt}
         ]
         
-        response = openai_client.chat.completions.create(
-            model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'),
-            messages=messages,
-            temperature=0.3,
-            response_format={"type": "json_object"}
-        )
-        
-        result = json.loads(response.choices[0].message.content)
-        logger.info(f"LLM schedule response: {json.dumps(result, indent=2)}")
+        model = os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo')
+        temperature = get_temperature()
+        cache_key = CompletionCache.make_key(model, temperature, messages)
+        content = _schedule_cache.get(cache_key)
+        if content is None:
+            response = get_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                response_format={"type": "json_object"},
+                **SAMPLING_PARAMS
+            )
+            content = response.choices[0].message.content
+        
+        result = orjson.loads(content)
+        # Only cache replies that parsed
+        _schedule_cache.put(cache_key, content)
+        logger.info(f"LLM schedule response: {content}")
         
         # Parse the schedule
         schedule = {}
@@ -347,28 +365,33 @@ def confirm_and_apply_due_dates(work_id: int, schedule_data: Dict[int, str]) ->
         logger.error(f"Work {work_id} not found")
         return False
     
-    manager = DueDateManager()
-    success_count = 0
     now = datetime.utcnow()
+    tomorrow = (now + timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
     
+    # Parse every date up front (each distinct string once), then write them all
+    # with one batched UPDATE instead of a lookup + update per task
+    parsed = {}
+    due_map = {}
     for task_id, date_str in schedule_data.items():
         try:
-            # Parse date and set to 8am
-            due_date = datetime.strptime(date_str, '%Y-%m-%d')
-            due_date = due_date.replace(hour=8, minute=0, second=0, microsecond=0)
-            
-            # Ensure date is in the future
-            if due_date < now:
-                logger.warning(f"Due date {due_date} is in the past, adjusting to tomorrow")
-                due_date = now + timedelta(days=1)
+            due_date = parsed.get(date_str)
+            if due_date is None:
+                # Parse date and set to 8am
+                due_date = datetime.strptime(date_str, '%Y-%m-%d')
                 due_date = due_date.replace(hour=8, minute=0, second=0, microsecond=0)
-            
-            if manager.set_due_date(task_id, due_date, source="user_confirmed"):
-                success_count += 1
-            else:
-                logger.error(f"Failed to set due date for task {task_id}")
-        except ValueError as e:
+                
+                # Ensure date is in the future
+                if due_date < now:
+                    logger.warning(f"Due date {due_date} is in the past, adjusting to tomorrow")
+                    due_date = tomorrow
+                parsed[date_str] = due_date
+            due_map[int(task_id)] = due_date
+        except (TypeError, ValueError) as e:
             logger.error(f"Invalid date format for task {task_id}: {date_str} - {e}")
     
+    logger.info(f"Setting due dates for {len(due_map)} tasks (source: user_confirmed)")
+    results = reschedule_tasks(due_map)
+    success_count = sum(results.values())
+    
     logger.info(f"Successfully applied {success_count}/{len(schedule_data)} due dates for work {work_id}")
     return success_count == len(schedule_data)
@@ -60,6 +60,46 @@ def log_conversation_feedback(
         db.close()
 
 
+def log_conversation_feedback_bulk(entries: List[Dict[str, Any]]) -> List[Optional[int]]:
+    """Log several conversation feedback records in one transaction.
+    
+    Args:
+        entries: Dicts with log_conversation_feedback's keyword arguments
+        
+    Returns:
+        Feedback log IDs in input order (all None if the write failed)
+    """
+    if not entries:
+        return []
+    
+    db = SessionLocal()
+    try:
+        logs = [
+            ConversationLog(
+                conversation_summary=entry['conversation_summary'],
+                what_went_well=entry.get('what_went_well'),
+                what_could_improve=entry.get('what_could_improve'),
+                user_satisfaction_estimate=entry.get('user_satisfaction_estimate'),
+                context_tags=','.join(entry['context_tags']) if entry.get('context_tags') else None
+            )
+            for entry in entries
+        ]
+        
+        db.add_all(logs)
+        db.commit()
+        
+        ids = [log.id for log in logs]
+        logger.info(f"Logged {len(ids)} conversation feedback records: {ids}")
+        return ids
+        
+    except Exception:
+        logger.exception("Failed to log conversation feedback batch")
+        db.rollback()
+        return [None] * len(entries)
+    finally:
+        db.close()
+
+
 def get_recent_feedback(days: int = 30, limit: int = 50) -> List[Dict[str, Any]]:
     """Get recent conversation feedback logs.
     
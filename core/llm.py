@@ -0,0 +1,88 @@
+"""Shared helpers for OpenAI chat completions.
+
+Provides a shared OpenAI client and an exact-match LRU cache for completion
+text so repeated prompts (Slack retries, re-running the same breakdown or
+schedule proposal) skip the API round-trip.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
+from typing import Any, Optional
+
+from openai import OpenAI
+
+
+@lru_cache(maxsize=8)
+def _client_for(api_key: Optional[str], base_url: Optional[str]) -> OpenAI:
+    """Build (once per credentials) an OpenAI client."""
+    return OpenAI(api_key=api_key, base_url=base_url)
+
+
+def get_client() -> OpenAI:
+    """Get the OpenAI client for the configured API key and base URL.
+    
+    Clients are shared per (OPENAI_API_KEY, OPENAI_BASE_URL) so callers reuse
+    one HTTP connection pool instead of paying TCP/TLS setup per client.
+    
+    Returns:
+        Shared OpenAI client
+    """
+    return _client_for(os.environ.get('OPENAI_API_KEY'), os.environ.get('OPENAI_BASE_URL'))
+
+
+# Greedy, seeded sampling: identical prompts give identical (cacheable) replies
+# and fewer malformed JSON objects
+SAMPLING_PARAMS = {"top_p": 1, "seed": 0}
+
+
+def get_temperature() -> float:
+    """Get the completion temperature (OPENAI_TEMPERATURE, default 0)."""
+    return float(os.environ.get('OPENAI_TEMPERATURE', '0'))
+
+
+class CompletionCache:
+    """Thread-safe LRU cache of completion text keyed by request contents."""
+    
+    def __init__(self, max_size: int = 256):
+        """Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of completions to keep
+        """
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """Build a cache key from JSON-serializable request parts (model, temperature, messages...)."""
+        return hashlib.sha256(
+            json.dumps(parts, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached completion for key, or None."""
+        with self._lock:
+            content = self._entries.get(key)
+            if content is not None:
+                self._entries.move_to_end(key)
+            return content
+    
+    def put(self, key: str, content: str):
+        """Store a completion, evicting the least recently used entries."""
+        if not content:
+            return
+        with self._lock:
+            self._entries[key] = content
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop all cached completions."""
+        with self._lock:
+            self._entries.clear()
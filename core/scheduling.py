@@ -5,7 +5,7 @@ with automatic next-task scheduling, and managing calendar sync.
 """
 
 import logging
-from typing import Optional
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 
 from db import Task, Work
@@ -19,6 +19,22 @@ from .slack import get_notifier
 
 logger = logging.getLogger(__name__)
 
+# Queues a remote due date sync job ([[Google Task ID, ISO due], ...]) on a
+# background worker, returning False if it could not; set by the app layer
+_due_date_sync_dispatcher: Optional[Callable[[List[List[str]]], bool]] = None
+
+
+def set_due_date_sync_dispatcher(dispatcher: Optional[Callable[[List[List[str]]], bool]]):
+    """Register how reschedule_tasks hands Google Tasks due date syncs to a worker.
+    
+    Without a dispatcher (or when it returns False) the sync runs inline.
+    
+    Args:
+        dispatcher: Called with [[Google Task ID, ISO due], ...]; returns True if queued
+    """
+    global _due_date_sync_dispatcher
+    _due_date_sync_dispatcher = dispatcher
+
 
 def ensure_task_scheduled(task_id: int, work_title: Optional[str] = None, skip_notification: bool = False) -> bool:
     """Ensure a task has a corresponding Google Tasks entry.
@@ -92,7 +108,7 @@ def ensure_task_scheduled(task_id: int, work_title: Optional[str] = None, skip_n
     return True
 
 
-def update_task_due_date_in_calendar(task_id: int, new_due: datetime) -> bool:
+def update_task_due_date_in_calendar(task_id: int, new_due: datetime) -> Optional[Task]:
     """Update a task's due date in both database and Google Tasks.
     
     Args:
@@ -100,12 +116,12 @@ def update_task_due_date_in_calendar(task_id: int, new_due: datetime) -> bool:
         new_due: New due datetime
         
     Returns:
-        True if updated successfully, False otherwise
+        Updated Task object, or None if not found
     """
     task = get_task_by_id(task_id)
     if not task:
         logger.error(f"Task {task_id} not found")
-        return False
+        return None
     
     # Update in Google Tasks if scheduled
     if task.calendar_event_id:
@@ -120,12 +136,11 @@ def update_task_due_date_in_calendar(task_id: int, new_due: datetime) -> bool:
     
     if updated_task:
         logger.info(f"Updated due date for task {task_id} to {new_due}")
-        return True
     
-    return False
+    return updated_task
 
 
-def reschedule_task(task_id: int, new_due: datetime) -> bool:
+def reschedule_task(task_id: int, new_due: datetime) -> Optional[Task]:
     """Reschedule a task to a new due date.
     
     Updates both database and Google Tasks.
@@ -135,29 +150,80 @@ def reschedule_task(task_id: int, new_due: datetime) -> bool:
         new_due: New due datetime
         
     Returns:
-        True if rescheduled successfully
+        Updated Task object, or None if not found
     """
     return update_task_due_date_in_calendar(task_id, new_due)
 
 
-def complete_task_and_schedule_next(task_id: int) -> bool:
+def reschedule_tasks(task_due_map: Dict[int, datetime]) -> Dict[int, bool]:
+    """Reschedule many tasks at once.
+    
+    Database due dates are written in one batched UPDATE; only tasks that
+    already have a Google Task are then updated remotely, as one job for the
+    dispatcher set with set_due_date_sync_dispatcher (inline if there is none
+    or it cannot queue the job).
+    
+    Args:
+        task_due_map: Dict mapping task_id -> new due datetime
+        
+    Returns:
+        Dict mapping task_id -> success boolean
+    """
+    from .storage import update_task_due_dates
+    updated = update_task_due_dates(task_due_map)
+    
+    remote = []
+    results = {}
+    for task_id, new_due in task_due_map.items():
+        if task_id not in updated:
+            logger.error(f"Task {task_id} not found")
+            results[task_id] = False
+            continue
+        
+        event_id = updated[task_id]
+        if event_id:
+            remote.append((event_id, new_due))
+        
+        logger.info(f"Updated due date for task {task_id} to {new_due}")
+        results[task_id] = True
+    
+    if remote:
+        _sync_remote_due_dates(remote)
+    return results
+
+
+def _sync_remote_due_dates(updates: List[Tuple[str, datetime]]):
+    """Push (Google Task ID, due) pairs to Google Tasks via the registered dispatcher, or inline."""
+    job = [[event_id, due.isoformat()] for event_id, due in updates]
+    if _due_date_sync_dispatcher is not None and _due_date_sync_dispatcher(job):
+        logger.info(f"Queued Google Tasks due date sync for {len(job)} tasks")
+        return
+    
+    provider = get_provider()
+    for event_id, due in updates:
+        if not provider.update_task(event_id, due=due):
+            logger.warning(f"Failed to update Google Task {event_id}")
+
+
+def complete_task_and_schedule_next(task_id: int) -> Optional[Task]:
     """Complete a task and automatically schedule the next task in the work.
     
     Args:
         task_id: Task ID to complete
         
     Returns:
-        True if completed successfully
+        The completed task (as loaded before completion), or None if the task
+        or its work wasn't found
     """
     task = get_task_by_id(task_id)
     if not task:
         logger.error(f"Task {task_id} not found")
-        return False
+        return None
     
     work = get_work_by_id(task.work_id, include_tasks=True)
     if not work:
         logger.error(f"Work {task.work_id} not found for task {task_id}")
-        return False
+        return None
     
     # Mark task as completed in database
     update_task_status(task_id, TaskStatus.COMPLETED)
@@ -196,7 +262,7 @@ def complete_task_and_schedule_next(task_id: int) -> bool:
         # Send work completion notification
         notifier.send_work_completed(work)
     
-    return True
+    return task
 
 
 def sync_from_google_tasks(task_id: int) -> bool:
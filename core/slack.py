@@ -6,6 +6,8 @@ Consolidates all Slack formatting and sending logic with Block Kit support.
 import os
 import logging
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import List, Dict, Any, Optional
 from datetime import datetime, date
 
@@ -15,6 +17,33 @@ from db import Work, Task
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Slack Block Kit limits: blocks per message, characters per section text
+MAX_BLOCKS_PER_MESSAGE = 50
+MAX_SECTION_CHARS = 3000
+
+# (connect, read) timeouts for webhook posts: fail fast if Slack is unreachable,
+# but give a slow response time to arrive
+WEBHOOK_TIMEOUT = (3.05, 10)
+
+# Shared HTTP session, so webhook posts reuse pooled keep-alive connections
+# instead of a new TCP/TLS handshake per message
+_session: Optional[requests.Session] = None
+
+
+def get_http_session() -> requests.Session:
+    """Get or create the pooled HTTP session used for Slack webhook posts."""
+    global _session
+    if _session is None:
+        session = requests.Session()
+        # Retries cover connection failures only (urllib3 doesn't resend a POST once
+        # it was sent), so a message is never posted twice
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _session = session
+    return _session
+
 
 class SlackNotifier:
     """Centralized Slack notification manager."""
@@ -40,7 +69,7 @@ class SlackNotifier:
         
         payload = {"text": message}
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = get_http_session().post(self.webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
             if response.status_code != 200:
                 logger.error(f"Slack notification failed: {response.status_code} - {response.text}")
                 return False
@@ -50,6 +79,88 @@ class SlackNotifier:
             logger.exception(f"Failed to send Slack notification: {e}")
             return False
     
+    def enqueue(self, payloads: List[Dict[str, Any]]) -> bool:
+        """Hand webhook payloads to the Celery worker to post (celery_app.send_slack_webhook).
+        
+        The caller returns after the broker publish instead of waiting on Slack;
+        the worker retries timeouts and connection errors.
+        
+        Args:
+            payloads: Webhook JSON payloads, in posting order
+            
+        Returns:
+            True if all were queued, False if the webhook isn't configured or the
+            broker can't be reached (the caller should post inline instead)
+        """
+        if not self.webhook_url:
+            return False
+        import celery_app
+        calls = [(self.webhook_url, payload) for payload in payloads]
+        if not celery_app.try_publish(celery_app.send_slack_webhook, calls):
+            return False
+        logger.info(f"Queued {len(payloads)} Slack notification(s) for the worker")
+        return True
+    
+    @staticmethod
+    def _batch_payloads(messages: List[str]) -> List[Dict[str, Any]]:
+        """Build send_batch's webhook payloads: a section block (plus divider) per message."""
+        # Section + divider per message, leaving room within the block limit
+        per_post = MAX_BLOCKS_PER_MESSAGE // 2
+        payloads = []
+        for start in range(0, len(messages), per_post):
+            chunk = messages[start:start + per_post]
+            blocks = []
+            for message in chunk:
+                if blocks:
+                    blocks.append({"type": "divider"})
+                blocks.append({
+                    "type": "section",
+                    "text": {"type": "mrkdwn", "text": message[:MAX_SECTION_CHARS]}
+                })
+            payloads.append({"blocks": blocks, "text": "\n".join(chunk)})
+        return payloads
+    
+    def send_batch(self, messages: List[str], background: bool = False) -> bool:
+        """Send several notification messages as one Slack post.
+        
+        Each message becomes its own section block (separated by dividers), so a
+        burst of notifications costs one webhook round-trip instead of one each.
+        
+        Args:
+            messages: Message texts, in display order
+            background: Queue the posts for the Celery worker (see enqueue), posting
+                inline only if that fails
+            
+        Returns:
+            True if every post succeeded (or was queued), False otherwise
+        """
+        if not messages:
+            return True
+        if len(messages) == 1:
+            if background and self.enqueue([{"text": messages[0]}]):
+                return True
+            return self.send_plain(messages[0])
+        if not self.webhook_url:
+            logger.warning("Cannot send Slack messages: webhook URL not configured")
+            return False
+        
+        payloads = self._batch_payloads(messages)
+        if background and self.enqueue(payloads):
+            return True
+        ok = True
+        for payload in payloads:
+            try:
+                response = get_http_session().post(self.webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
+                if response.status_code != 200:
+                    logger.error(f"Slack batch notification failed: {response.status_code} - {response.text}")
+                    ok = False
+                    continue
+                logger.info("Slack batch notification sent")
+            except Exception as e:
+                logger.exception(f"Failed to send Slack batch notification: {e}")
+                ok = False
+        return ok
+    
     def send_interactive(self, work: Work) -> bool:
         """Send interactive Slack message for due date confirmation.
         
@@ -70,7 +181,7 @@ class SlackNotifier:
         }
         
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = get_http_session().post(self.webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
             if response.status_code != 200:
                 logger.error(f"Slack interactive message failed: {response.status_code} - {response.text}")
                 return False
@@ -80,12 +191,15 @@ class SlackNotifier:
             logger.exception(f"Failed to send Slack interactive message: {e}")
             return False
     
-    def send_publish(self, work: Work, calendar_task: Optional[Task] = None) -> bool:
+    def send_publish(self, work: Work, calendar_task: Optional[Task] = None,
+                     background: bool = False) -> bool:
         """Send publication notification for a work item.
         
         Args:
             work: Published work item
             calendar_task: Task that was added to calendar (optional)
+            background: Queue the post for the Celery worker (see enqueue), posting
+                inline only if that fails
             
         Returns:
             True if sent successfully, False otherwise
@@ -99,9 +213,11 @@ class SlackNotifier:
             "blocks": blocks,
             "text": f"Work '{work.title}' published"
         }
+        if background and self.enqueue([payload]):
+            return True
         
         try:
-            response = requests.post(self.webhook_url, json=payload, timeout=10)
+            response = get_http_session().post(self.webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
             if response.status_code != 200:
                 logger.error(f"Slack publish notification failed: {response.status_code} - {response.text}")
                 return False
@@ -121,8 +237,7 @@ class SlackNotifier:
         Returns:
             True if sent successfully
         """
-        message = f"✅ Task completed: '{task.title}' in work '{work.title}'"
-        return self.send_plain(message)
+        return self.send_plain(self.format_task_completed(task, work))
     
     def send_work_completed(self, work: Work) -> bool:
         """Send notification that a work item was completed.
@@ -133,9 +248,7 @@ class SlackNotifier:
         Returns:
             True if sent successfully
         """
-        task_count = len(work.tasks) if hasattr(work, 'tasks') else 0
-        message = f"🎉 Work completed: '{work.title}' ({task_count} tasks finished)"
-        return self.send_plain(message)
+        return self.send_plain(self.format_work_completed(work))
     
     def send_snooze_followup(self, task: Task, work: Work) -> bool:
         """Send notification for tasks snoozed multiple times.
@@ -176,8 +289,7 @@ class SlackNotifier:
         Returns:
             True if sent successfully
         """
-        message = f"🔔 *{work.title}* - Updates\n" + "\n".join([f"  • {c}" for c in changes])
-        return self.send_plain(message)
+        return self.send_plain(self.format_grouped_alert(work.title, changes))
     
     def send_event_created(self, task: Task, work: Work) -> bool:
         """Send notification that a calendar event was created.
@@ -207,6 +319,22 @@ class SlackNotifier:
         message = f"📆 *Rescheduled:* {task.title}" + (f" - {due_str}" if due_str else "")
         return self.send_plain(message)
     
+    @staticmethod
+    def format_task_completed(task: Task, work: Work) -> str:
+        """Message text for a completed task."""
+        return f"✅ Task completed: '{task.title}' in work '{work.title}'"
+    
+    @staticmethod
+    def format_work_completed(work: Work) -> str:
+        """Message text for a completed work item."""
+        task_count = len(work.tasks) if hasattr(work, 'tasks') else 0
+        return f"🎉 Work completed: '{work.title}' ({task_count} tasks finished)"
+    
+    @staticmethod
+    def format_grouped_alert(work_title: str, changes: List[str]) -> str:
+        """Message text for a set of changes to one work item."""
+        return f"🔔 *{work_title}* - Updates\n" + "\n".join([f"  • {c}" for c in changes])
+    
     def _build_interactive_blocks(self, work: Work) -> List[Dict[str, Any]]:
         """Build Block Kit blocks for interactive due date confirmation.
         
@@ -4,7 +4,7 @@ Consolidates CRUD operations from db.py with agent-friendly filtering
 for work items and tasks by status.
 """
 
-from typing import List, Optional, Generator
+from typing import Dict, List, Optional, Generator, Tuple
 from contextlib import contextmanager
 from datetime import datetime
 
@@ -47,7 +47,7 @@ def list_works(status: Optional[WorkStatus] = None, include_tasks: bool = False)
     
     Args:
         status: Filter by work status (None returns all)
-        include_tasks: Whether to eagerly load tasks relationship
+        include_tasks: Whether to eagerly load tasks relationship (selectin)
         
     Returns:
         List of Work objects matching criteria
@@ -59,8 +59,76 @@ def list_works(status: Optional[WorkStatus] = None, include_tasks: bool = False)
             query = query.filter(Work.status == str(status))
         
         if include_tasks:
-            from sqlalchemy.orm import joinedload
-            query = query.options(joinedload(Work.tasks))
+            # selectinload issues one extra IN-query for all children instead of
+            # widening every work row with a JOIN (or lazy-loading per work)
+            from sqlalchemy.orm import selectinload
+            query = query.options(selectinload(Work.tasks))
+        
+        query = query.order_by(Work.created_at.desc())
+        return query.all()
+
+
+def list_works_with_counts(status: Optional[WorkStatus] = None) -> List[Tuple[Work, int, int]]:
+    """List work items with task counts aggregated in SQL.
+    
+    Args:
+        status: Filter by work status (None returns all)
+    
+    Returns:
+        List of (Work, task_count, completed_count) tuples
+    """
+    with get_session() as session:
+        from sqlalchemy import func, case
+        task_count = func.count(Task.id)
+        completed_count = func.coalesce(
+            func.sum(case((Task.status == str(TaskStatus.COMPLETED), 1), else_=0)), 0
+        )
+        query = session.query(Work, task_count, completed_count).outerjoin(
+            Task, Task.work_id == Work.id
+        )
+        
+        if status:
+            query = query.filter(Work.status == str(status))
+        
+        query = query.group_by(Work.id).order_by(Work.created_at.desc())
+        return [(work, total, completed) for work, total, completed in query.all()]
+
+
+def list_next_tasks_by_work(status: Optional[WorkStatus] = WorkStatus.PUBLISHED) -> List[Tuple]:
+    """List each work's next incomplete task in a single query.
+    
+    A ROW_NUMBER() window over open tasks picks the earliest-due task per work
+    (undated tasks last), so only one task row per work is returned.
+    
+    Args:
+        status: Filter by work status (None returns all)
+        
+    Returns:
+        List of named rows (work_id, work_title, work_status, task_id, task_title,
+        due_date, remaining_tasks), newest work first. Works with no open tasks are omitted.
+    """
+    with get_session() as session:
+        from sqlalchemy import func
+        open_tasks = session.query(
+            Task.work_id.label('work_id'),
+            Task.id.label('task_id'),
+            Task.title.label('task_title'),
+            Task.due_date.label('due_date'),
+            func.row_number().over(
+                partition_by=Task.work_id,
+                order_by=(Task.due_date.asc().nullslast(), Task.id.asc())
+            ).label('rank'),
+            func.count().over(partition_by=Task.work_id).label('remaining_tasks')
+        ).filter(Task.status != str(TaskStatus.COMPLETED)).subquery()
+        
+        query = session.query(
+            Work.id.label('work_id'), Work.title.label('work_title'), Work.status.label('work_status'),
+            open_tasks.c.task_id, open_tasks.c.task_title, open_tasks.c.due_date,
+            open_tasks.c.remaining_tasks
+        ).join(open_tasks, open_tasks.c.work_id == Work.id).filter(open_tasks.c.rank == 1)
+        
+        if status:
+            query = query.filter(Work.status == str(status))
         
         query = query.order_by(Work.created_at.desc())
         return query.all()
@@ -173,6 +241,101 @@ def list_tasks(work_id: Optional[int] = None, status: Optional[TaskStatus] = Non
         return query.all()
 
 
+def list_task_ids_missing_due_date(work_id: int) -> Optional[List[int]]:
+    """IDs of a work's incomplete tasks that have no due date, in a single query.
+    
+    Args:
+        work_id: Work item ID
+        
+    Returns:
+        Task IDs in creation order (empty if every open task has a due date),
+        or None if the work doesn't exist
+    """
+    with get_session() as session:
+        from sqlalchemy import and_
+        # Outer join from the work so a missing work (no row) is told apart
+        # from a work with nothing missing (one row with a NULL task id)
+        rows = session.query(Task.id).select_from(Work).outerjoin(Task, and_(
+            Task.work_id == Work.id,
+            Task.due_date.is_(None),
+            Task.status != str(TaskStatus.COMPLETED),
+        )).filter(Work.id == work_id).order_by(Task.created_at.asc()).all()
+        if not rows:
+            return None
+        return [task_id for (task_id,) in rows if task_id is not None]
+
+
+def list_task_rows(work_id: Optional[int] = None, status: Optional[TaskStatus] = None,
+                   due_after: Optional[datetime] = None, due_before: Optional[datetime] = None,
+                   exclude_completed: bool = False) -> List[Tuple]:
+    """List lightweight task rows without hydrating ORM objects.
+    
+    Selects only the columns listings need, joined to the parent work title.
+    
+    Args:
+        work_id: Filter by work item (None returns all tasks)
+        status: Filter by task status
+        due_after: Filter tasks due at or after this datetime
+        due_before: Filter tasks due before this datetime
+        exclude_completed: Quick filter to exclude completed tasks
+        
+    Returns:
+        List of named rows (id, title, status, work_id, work_title, due_date,
+        snooze_count, calendar_event_id) ordered by due date
+    """
+    with get_session() as session:
+        query = session.query(
+            Task.id, Task.title, Task.status, Task.work_id,
+            Work.title.label('work_title'), Task.due_date,
+            Task.snooze_count, Task.calendar_event_id
+        ).outerjoin(Work, Task.work_id == Work.id)
+        
+        if work_id is not None:
+            query = query.filter(Task.work_id == work_id)
+        
+        if status:
+            query = query.filter(Task.status == str(status))
+        
+        if exclude_completed:
+            query = query.filter(Task.status != str(TaskStatus.COMPLETED))
+        
+        if due_after:
+            query = query.filter(Task.due_date >= due_after)
+        
+        if due_before:
+            query = query.filter(Task.due_date < due_before)
+        
+        query = query.order_by(Task.due_date.asc().nullsfirst(), Task.created_at.asc())
+        return query.all()
+
+
+def list_overdue_task_rows(now: datetime) -> List[Tuple]:
+    """List open tasks due before now, with whole days overdue computed in SQL.
+    
+    Args:
+        now: Reference time (naive UTC, matching stored due dates)
+        
+    Returns:
+        List of named rows (id, title, status, work_title, due_date, days_overdue)
+    """
+    with get_session() as session:
+        from sqlalchemy import func, Integer
+        # julianday difference is fractional days; CAST truncates like timedelta.days for past dates
+        days_overdue = func.cast(
+            func.julianday(now) - func.julianday(Task.due_date), Integer
+        ).label('days_overdue')
+        query = session.query(
+            Task.id, Task.title, Task.status, Work.title.label('work_title'),
+            Task.due_date, days_overdue
+        ).outerjoin(Work, Task.work_id == Work.id).filter(
+            Task.due_date < now,
+            Task.status != str(TaskStatus.COMPLETED)
+        )
+        
+        query = query.order_by(Task.due_date.asc(), Task.created_at.asc())
+        return query.all()
+
+
 def get_task_by_id(task_id: int) -> Optional[Task]:
     """Fetch a single task by ID with work relationship loaded."""
     with get_session() as session:
@@ -189,6 +352,23 @@ def get_task_by_calendar_id(calendar_event_id: str) -> Optional[Task]:
         ).first()
 
 
+def get_calendar_task_for_work(work_id: int) -> Optional[Task]:
+    """Fetch the first task of a work that is scheduled or being tracked.
+    
+    Args:
+        work_id: Work item ID
+        
+    Returns:
+        First task (by ID) with a calendar event or TRACKED status, or None
+    """
+    with get_session() as session:
+        from sqlalchemy import or_
+        return session.query(Task).filter(
+            Task.work_id == work_id,
+            or_(Task.calendar_event_id.isnot(None), Task.status == str(TaskStatus.TRACKED))
+        ).order_by(Task.id.asc()).first()
+
+
 def create_task(work_id: int, title: str, status: TaskStatus = TaskStatus.DRAFT,
                 due_date: Optional[datetime] = None) -> Task:
     """Create a new task for a work item.
@@ -222,6 +402,32 @@ def update_task_status(task_id: int, new_status: TaskStatus) -> Optional[Task]:
         return db_update_task_status(session, task_id, str(new_status))
 
 
+def complete_task_returning_event(task_id: int) -> Tuple[bool, Optional[str]]:
+    """Mark a task completed and return its calendar event ID in one statement.
+    
+    Uses UPDATE ... RETURNING so callers don't need a follow-up SELECT to
+    find the Google Task to complete.
+    
+    Args:
+        task_id: Task ID
+        
+    Returns:
+        (found, calendar_event_id) - found is False if the task doesn't exist
+    """
+    with get_session() as session:
+        from sqlalchemy import update
+        row = session.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(status=str(TaskStatus.COMPLETED))
+            .returning(Task.calendar_event_id)
+        ).first()
+        session.commit()
+        if row is None:
+            return False, None
+        return True, row[0]
+
+
 def update_task_due_date(task_id: int, due_date: datetime) -> Optional[Task]:
     """Update task due date.
     
@@ -241,6 +447,35 @@ def update_task_due_date(task_id: int, due_date: datetime) -> Optional[Task]:
         return task
 
 
+def update_task_due_dates(due_map: Dict[int, datetime]) -> Dict[int, Optional[str]]:
+    """Update due dates for many tasks with a single executemany UPDATE.
+    
+    Args:
+        due_map: Dict mapping task_id -> new due datetime
+        
+    Returns:
+        Dict mapping each updated task_id -> its calendar_event_id (None if unscheduled).
+        Task IDs that don't exist are omitted.
+    """
+    if not due_map:
+        return {}
+    
+    with get_session() as session:
+        from sqlalchemy import update
+        rows = session.query(Task.id, Task.calendar_event_id).filter(
+            Task.id.in_(list(due_map))
+        ).all()
+        found = {task_id: event_id for task_id, event_id in rows}
+        
+        if found:
+            session.execute(
+                update(Task),
+                [{'id': task_id, 'due_date': due_map[task_id]} for task_id in found]
+            )
+            session.commit()
+        return found
+
+
 def update_task_calendar_event(task_id: int, event_id: str) -> Optional[Task]:
     """Update task's calendar event ID.
     
@@ -270,12 +505,14 @@ def increment_task_snooze(task_id: int) -> Optional[Task]:
 
 def get_today_tasks() -> List[Task]:
     """Get all non-completed tasks due today."""
-    from datetime import date
-    today = date.today()
+    from datetime import date, timedelta
+    start = datetime.combine(date.today(), datetime.min.time())
+    end = start + timedelta(days=1)
     with get_session() as session:
         from sqlalchemy.orm import joinedload
-        from sqlalchemy import func, Date, cast
+        # Range predicate (not CAST(due_date AS DATE)) so ix_task_open_due can seek
         return session.query(Task).options(joinedload(Task.work)).filter(
-            cast(Task.due_date, Date) == today,
+            Task.due_date >= start,
+            Task.due_date < end,
             Task.status != str(TaskStatus.COMPLETED)
         ).all()
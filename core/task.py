@@ -4,6 +4,7 @@ Defines canonical task statuses with Google Tasks API mapping.
 """
 
 from enum import Enum
+from types import MappingProxyType
 
 
 class TaskStatus(str, Enum):
@@ -25,17 +26,7 @@ class TaskStatus(str, Enum):
             return cls.DRAFT
         
         normalized = value.strip().lower()
-        mapping = {
-            'draft': cls.DRAFT,
-            'pending': cls.DRAFT,  # Legacy mapping
-            'published': cls.PUBLISHED,
-            'tracked': cls.TRACKED,
-            'completed': cls.COMPLETED,
-            'done': cls.COMPLETED,
-            'needsaction': cls.PUBLISHED,  # From Google Tasks
-            'needs_action': cls.PUBLISHED,
-        }
-        return mapping.get(normalized, cls.DRAFT)
+        return _TASK_STATUS_LOOKUP.get(normalized, cls.DRAFT)
     
     @classmethod
     def from_google_tasks(cls, google_status: str):
@@ -56,6 +47,19 @@ class TaskStatus(str, Enum):
         return self.value
 
 
+# Normalized (lowercase) status string -> canonical status, built once at import
+_TASK_STATUS_LOOKUP = MappingProxyType({
+    'draft': TaskStatus.DRAFT,
+    'pending': TaskStatus.DRAFT,  # Legacy mapping
+    'published': TaskStatus.PUBLISHED,
+    'tracked': TaskStatus.TRACKED,
+    'completed': TaskStatus.COMPLETED,
+    'done': TaskStatus.COMPLETED,
+    'needsaction': TaskStatus.PUBLISHED,  # From Google Tasks
+    'needs_action': TaskStatus.PUBLISHED,
+})
+
+
 def can_transition(from_status: TaskStatus, to_status: TaskStatus) -> bool:
     """Check if a task status transition is valid.
     
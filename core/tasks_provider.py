@@ -23,6 +23,8 @@ logger = logging.getLogger(__name__)
 
 SCOPES = ['https://www.googleapis.com/auth/tasks']
 DEFAULT_TASKLIST_NAME = "Task manager"
+# Seconds to reuse the last open-task listing (absorbs Slack retries / repeated agent calls)
+UPCOMING_CACHE_TTL = 60
 
 
 class GoogleTasksProvider:
@@ -41,6 +43,7 @@ class GoogleTasksProvider:
         self.creds = None
         self.service = None
         self._tasklist_id_cache = None
+        self._open_tasks_cache = None  # (fetched_at monotonic, tasks)
         
         self._initialize_credentials()
     
@@ -172,6 +175,7 @@ class GoogleTasksProvider:
         for attempt in range(1, max_retries + 1):
             try:
                 created = self.service.tasks().insert(tasklist=tasklist_id, body=task_body).execute()
+                self._open_tasks_cache = None
                 logger.info(f"Created task: {created.get('id')}")
                 return created
             except socket.timeout as e:
@@ -232,6 +236,7 @@ class GoogleTasksProvider:
             
             # Update
             updated = self.service.tasks().update(tasklist=tasklist_id, task=task_id, body=task).execute()
+            self._open_tasks_cache = None
             logger.info(f"Updated task: {task_id}")
             return updated
         
@@ -262,6 +267,7 @@ class GoogleTasksProvider:
         
         try:
             self.service.tasks().delete(tasklist=tasklist_id, task=task_id).execute()
+            self._open_tasks_cache = None
             logger.info(f"Deleted task: {task_id}")
             return True
         except OSError as e:
@@ -335,13 +341,24 @@ class GoogleTasksProvider:
     def list_upcoming_tasks(self, max_results: int = 10) -> List[Dict[str, Any]]:
         """List upcoming tasks with due dates in the future.
         
+        The underlying open-task listing is reused for UPCOMING_CACHE_TTL
+        seconds and dropped whenever this provider creates, updates or
+        deletes a task.
+        
         Args:
             max_results: Maximum number of tasks to return
             
         Returns:
             List of upcoming task resources
         """
-        tasks = self.list_tasks(show_completed=False, max_results=100)
+        cached = self._open_tasks_cache
+        if cached and time.monotonic() - cached[0] < UPCOMING_CACHE_TTL:
+            tasks = cached[1]
+        else:
+            tasks = self.list_tasks(show_completed=False, max_results=100)
+            # list_tasks returns [] on API errors, so only keep non-empty listings
+            if tasks:
+                self._open_tasks_cache = (time.monotonic(), tasks)
         now = datetime.utcnow()
         upcoming = []
         
@@ -4,6 +4,7 @@ Defines canonical work statuses and validation logic.
 """
 
 from enum import Enum
+from types import MappingProxyType
 
 
 class WorkStatus(str, Enum):
@@ -19,18 +20,21 @@ class WorkStatus(str, Enum):
             return cls.DRAFT
         
         normalized = value.strip().lower()
-        mapping = {
-            'draft': cls.DRAFT,
-            'published': cls.PUBLISHED,
-            'completed': cls.COMPLETED,
-            'done': cls.COMPLETED,
-        }
-        return mapping.get(normalized, cls.DRAFT)
+        return _WORK_STATUS_LOOKUP.get(normalized, cls.DRAFT)
 
     def __str__(self):
         return self.value
 
 
+# Normalized (lowercase) status string -> canonical status, built once at import
+_WORK_STATUS_LOOKUP = MappingProxyType({
+    'draft': WorkStatus.DRAFT,
+    'published': WorkStatus.PUBLISHED,
+    'completed': WorkStatus.COMPLETED,
+    'done': WorkStatus.COMPLETED,
+})
+
+
 def can_transition(from_status: WorkStatus, to_status: WorkStatus) -> bool:
     """Check if a work status transition is valid.
     
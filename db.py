@@ -1,5 +1,5 @@
 from sqlalchemy import create_engine, Column, Integer, String, Text, ForeignKey, DateTime
-from sqlalchemy import Boolean
+from sqlalchemy import Boolean, Index, text
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
 from datetime import datetime
 import os
@@ -8,7 +8,9 @@ Base = declarative_base()
 
 # Use DATABASE_PATH env var if set, otherwise default to local path
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'task_manager.db')
-engine = create_engine(f'sqlite:///{DATABASE_PATH}')
+# One process-wide pool shared by every session: gunicorn threads, agent tools and
+# Celery tasks check connections out of it instead of opening their own
+engine = create_engine(f'sqlite:///{DATABASE_PATH}', pool_size=10, max_overflow=20)
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
 def get_db():
@@ -43,6 +45,18 @@ class Task(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     work = relationship('Work', back_populates='tasks')
 
+    __table_args__ = (
+        # Partial index over open tasks only: today/overdue lookups seek by due_date
+        # without scanning the growing history of completed tasks
+        Index('ix_task_open_due', 'due_date',
+              sqlite_where=text("status != 'Completed'"),
+              postgresql_where=text("status != 'Completed'")),
+        # Status-filtered listings (status = ? ORDER BY due_date) seek and read in order
+        Index('ix_task_status_due', 'status', 'due_date'),
+        # Per-work lookups (publish checks for tasks missing a due date) seek by work
+        Index('ix_task_work_due', 'work_id', 'due_date'),
+    )
+
 
 class WatchChannel(Base):
     __tablename__ = 'watch_channel'
@@ -80,6 +94,9 @@ class FeedbackSummary(Base):
 
 # Create tables
 Base.metadata.create_all(bind=engine)
+# create_all skips existing tables, so add any indexes missing from older databases
+for _index in Task.__table__.indexes:
+    _index.create(bind=engine, checkfirst=True)
 
 # CRUD functions
 
@@ -1,56 +1,216 @@
 
 import os
+import re
 import json
+import orjson
 from datetime import datetime
 from dotenv import load_dotenv
-from openai import OpenAI
 from db import create_work, create_task, get_db
+from core.llm import CompletionCache, SAMPLING_PARAMS, get_client, get_temperature
 from sqlalchemy.orm import Session
 
 load_dotenv()
 
-client = OpenAI(api_key=os.environ.get('OPENAI_API_KEY'))
+# Exact-match cache of raw completions keyed by (model, temperature, messages).
+# Repeated requests (Slack retries, re-running the same breakdown) skip the API call.
+_completion_cache = CompletionCache(max_size=256)
+
+# Both prompts ask for a single JSON object; JSON mode makes the API guarantee it,
+# so the prose/fence fallbacks in _parse_llm_json are only a safety net.
+_JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# ```json {...} ``` fenced blocks; tried before scanning the raw reply for braces
+_JSON_FENCE_RE = re.compile(r"```(?:json)?\s*(\{[\s\S]*?\})\s*```")
+
+
+def _complete(messages, temperature=None):
+    """Return the assistant reply for messages, serving repeats from the cache."""
+    if temperature is None:
+        temperature = get_temperature()
+    model = os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo')
+    key = CompletionCache.make_key(model, temperature, messages)
+    cached = _completion_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        content = _complete_streamed(model, messages, temperature)
+    except Exception as e:
+        print("Streaming completion failed, retrying without streaming.", e)
+        resp = get_client().chat.completions.create(
+            model=model, messages=messages, temperature=temperature,
+            response_format=_JSON_RESPONSE_FORMAT, **SAMPLING_PARAMS
+        )
+        try:
+            content = resp.choices[0].message.content
+        except Exception:
+            # Don't cache unexpected response shapes
+            return str(resp)
+
+    _completion_cache.put(key, content)
+    return content
+
+
+def _complete_streamed(model, messages, temperature):
+    """Stream a completion and stop reading once the first JSON object closes.
+    
+    The prompts ask for a single JSON object, so anything after its closing
+    brace is discarded; closing the stream early saves waiting for (and paying
+    for) trailing tokens. Replies without JSON are read to the end.
+    """
+    stream = get_client().chat.completions.create(
+        model=model, messages=messages, temperature=temperature,
+        response_format=_JSON_RESPONSE_FORMAT, stream=True, **SAMPLING_PARAMS
+    )
+    scanner = _JsonObjectScanner()
+    parts = []
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+            end = scanner.feed(delta)
+            if end != -1:
+                parts.append(delta[:end])
+                break
+            parts.append(delta)
+    finally:
+        stream.close()
+    return ''.join(parts)
+
+
+# System prompts are constant so every request shares the same prefix; only the
+# user message carries per-call content (task, current subtasks, feedback).
+_GENERATE_SYSTEM_PROMPT = (
+    "You are a JSON formatter and project assistant. "
+    "Given a user task, generate a crisp, short work item name (work_name), a concise work description (work_description), "
+    "and break down the task into a few practical, actionable subtasks (subtasks) that can be added to a calendar or reminder app. "
+    "IMPORTANT: Default to generating 3-5 subtasks based on the complexity and difficulty of the task. "
+    "For simple tasks, generate only 2-3 subtasks. For complex tasks, generate up to 5 subtasks. "
+    "Ensure the subtasks are necessary and avoid over-complicating simple tasks. "
+    "Each subtask must be a JSON object with exactly two keys: 'description' and 'priority'. "
+    "The 'description' should be a concise string, and 'priority' should be one of 'High', 'Medium', or 'Low'. "
+    "Output only a valid JSON object with three keys: 'work_name', 'work_description', and 'subtasks'. "
+    "Here is an example output:\n\n"
+    "{\n"
+    "  \"work_name\": \"Plan Team Offsite\",\n"
+    "  \"work_description\": \"Organize and plan a productive team offsite event.\",\n"
+    "  \"subtasks\": [\n"
+    "    {\"description\": \"Book venue\", \"priority\": \"High\"},\n"
+    "    {\"description\": \"Send invites\", \"priority\": \"Medium\"}\n"
+    "  ]\n"
+    "}"
+)
+
+_REVISE_SYSTEM_PROMPT = (
+    "You are an expert project manager and JSON formatter. Given the following subtasks (in JSON), revise them according to the user's feedback. "
+    "Also, generate a crisp, short work item name (work_name) and a concise work description (work_description) for the revised set. "
+    "Follow these rules strictly: "
+    "- If the user asks to add a new subtask, APPEND it to the list. Do NOT remove or replace any existing subtasks when adding. "
+    "- If the user asks to update or remove a subtask, do so ONLY for the specified subtask(s). "
+    "- Do NOT change, remove, or replace any subtask unless the feedback explicitly requests it. "
+    "- Never replace the entire list unless the user asks for a full rewrite. "
+    "Return the revised result as a JSON object with three keys: 'work_name', 'work_description', and 'subtasks'. "
+    "Each subtask must be an object with 'description' and 'priority'."
+)
+
+
+class _JsonObjectScanner:
+    """Incremental brace-balanced scanner for the first JSON object in a text stream.
+    
+    Tracks nesting depth and ignores braces inside string literals, so each
+    character is looked at once (linear in input, no regex backtracking).
+    """
+    
+    def __init__(self):
+        self.started = False
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, text):
+        """Consume text; return the index just past the object's closing brace, or -1."""
+        i = 0
+        if not self.started:
+            i = text.find('{')
+            if i == -1:
+                return -1
+            self.started = True
+        
+        for i in range(i, len(text)):
+            ch = text[i]
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif ch == '\\':
+                    self.escaped = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch == '{':
+                self.depth += 1
+            elif ch == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    return i + 1
+        return -1
+
+
+def _extract_json_object(s):
+    """Return the first balanced {...} substring of s, or None."""
+    start = s.find('{')
+    # No closing brace after the first '{' means no object; skip the scan
+    if start == -1 or s.rfind('}') < start:
+        return None
+    end = _JsonObjectScanner().feed(s[start:])
+    if end == -1:
+        return None
+    return s[start:start + end]
+
+
+def _parse_llm_json(content):
+    """Parse a JSON object from an LLM reply, tolerating surrounding text.
+    
+    Raises:
+        ValueError: If no JSON object can be parsed (orjson.JSONDecodeError is a ValueError).
+    """
+    content = content or ""
+    try:
+        return orjson.loads(content)
+    except orjson.JSONDecodeError as e:
+        error = e
+    
+    # Bare JSON failed: prefer fenced blocks, then the first balanced {...} in prose
+    if '```' in content:
+        for match in _JSON_FENCE_RE.finditer(content):
+            try:
+                return orjson.loads(match.group(1))
+            except orjson.JSONDecodeError:
+                continue
+    
+    candidate = _extract_json_object(content)
+    if candidate is None:
+        raise error
+    return orjson.loads(candidate)
 
 
 def generate_subtasks(task_description: str, max_subtasks: int = 4):
     now = datetime.now().isoformat()
-    system_prompt = (
-        "You are a JSON formatter and project assistant. "
-        "Given a user task, generate a crisp, short work item name (work_name), a concise work description (work_description), "
-        "and break down the task into a few practical, actionable subtasks (subtasks) that can be added to a calendar or reminder app. "
-        "IMPORTANT: Default to generating 3-5 subtasks based on the complexity and difficulty of the task. "
-        "For simple tasks, generate only 2-3 subtasks. For complex tasks, generate up to 5 subtasks. "
-        "Ensure the subtasks are necessary and avoid over-complicating simple tasks. "
-        "Each subtask must be a JSON object with exactly two keys: 'description' and 'priority'. "
-        "The 'description' should be a concise string, and 'priority' should be one of 'High', 'Medium', or 'Low'. "
-        "Output only a valid JSON object with three keys: 'work_name', 'work_description', and 'subtasks'. "
-        "Here is an example output:\n\n"
-        "{\n"
-        "  \"work_name\": \"Plan Team Offsite\",\n"
-        "  \"work_description\": \"Organize and plan a productive team offsite event.\",\n"
-        "  \"subtasks\": [\n"
-        "    {\"description\": \"Book venue\", \"priority\": \"High\"},\n"
-        "    {\"description\": \"Send invites\", \"priority\": \"Medium\"}\n"
-        "  ]\n"
-        "}"
-    )
     user_prompt = (
         f"Given the following user task, output only a valid JSON object as described above, with a maximum of {max_subtasks} subtasks.\n"
         f"Task: {task_description}\n\nJSON:"
     )
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": _GENERATE_SYSTEM_PROMPT},
         {"role": "user", "content": user_prompt}
     ]
-    # Call OpenAI ChatCompletion using the new OpenAI client
-    resp = client.chat.completions.create(model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'), messages=messages, temperature=0.2)
-    # Extract assistant reply
+    # Call OpenAI ChatCompletion (repeats are served from the completion cache)
+    response_content = _complete(messages)
     try:
-        response_content = resp.choices[0].message.content
-    except Exception:
-        response_content = str(resp)
-    try:
-        result = json.loads(response_content)
+        result = _parse_llm_json(response_content)
         # Validate structure
         if not all(k in result for k in ("work_name", "work_description", "subtasks")):
             raise ValueError("Missing required keys in LLM output.")
@@ -78,34 +238,18 @@ def generate_subtasks(task_description: str, max_subtasks: int = 4):
 # New function to revise/modify subtasks
 def revise_subtasks(original_subtasks, feedback, max_subtasks=4):
     now = datetime.now().isoformat()
-    system_prompt = (
-        "You are an expert project manager and JSON formatter. Given the following subtasks (in JSON), revise them according to the user's feedback. "
-        "Also, generate a crisp, short work item name (work_name) and a concise work description (work_description) for the revised set. "
-        "Follow these rules strictly: "
-        "- If the user asks to add a new subtask, APPEND it to the list. Do NOT remove or replace any existing subtasks when adding. "
-        "- If the user asks to update or remove a subtask, do so ONLY for the specified subtask(s). "
-        "- Do NOT change, remove, or replace any subtask unless the feedback explicitly requests it. "
-        "- Never replace the entire list unless the user asks for a full rewrite. "
-        "Return the revised result as a JSON object with three keys: 'work_name', 'work_description', and 'subtasks'. "
-        "Each subtask must be an object with 'description' and 'priority'. "
-        f"\n\nCurrent subtasks: {json.dumps(original_subtasks)}\n\nFeedback: {feedback}\n\nRevised result:"
-    )
     user_prompt = (
         f"Here are the current subtasks: {json.dumps(original_subtasks, ensure_ascii=False)}\n"
         f"User feedback: {feedback}\n"
         f"Update the subtasks as needed, output only a valid JSON object as described above, with a maximum of {max_subtasks} subtasks.\nJSON:"
     )
     messages = [
-        {"role": "system", "content": system_prompt},
+        {"role": "system", "content": _REVISE_SYSTEM_PROMPT},
         {"role": "user", "content": user_prompt}
     ]
-    resp = client.chat.completions.create(model=os.environ.get('OPENAI_MODEL', 'gpt-3.5-turbo'), messages=messages, temperature=0.2)
-    try:
-        response_content = resp.choices[0].message.content
-    except Exception:
-        response_content = str(resp)
+    response_content = _complete(messages)
     try:
-        result = json.loads(response_content)
+        result = _parse_llm_json(response_content)
         if not all(k in result for k in ("work_name", "work_description", "subtasks")):
             raise ValueError("Missing required keys in LLM output.")
         for task in result["subtasks"]:
@@ -0,0 +1,13 @@
+"""Gunicorn settings for the Flask app, read automatically from the working directory.
+
+Request handlers spend most of their time waiting on Slack, Google Tasks and the
+database, so each worker serves requests from a thread pool instead of one at a
+time. Override with WEB_CONCURRENCY / GUNICORN_THREADS / GUNICORN_TIMEOUT.
+"""
+
+import os
+
+worker_class = 'gthread'
+workers = int(os.environ.get('WEB_CONCURRENCY', '2'))
+threads = int(os.environ.get('GUNICORN_THREADS', '8'))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '60'))
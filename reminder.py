@@ -5,6 +5,7 @@ import requests
 import time
 import logging
 import socket
+import threading
 from dotenv import load_dotenv
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
@@ -547,10 +548,11 @@ class ReminderAgent:
         if not self.slack_webhook_url:
             print('Slack webhook URL not set in environment variables.')
             return
+        from core.slack import WEBHOOK_TIMEOUT, get_http_session
         payload = {
             "text": message
         }
-        response = requests.post(self.slack_webhook_url, json=payload)
+        response = get_http_session().post(self.slack_webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
         if response.status_code != 200:
             print('Failed to send Slack notification:', response.text)
         else:
@@ -569,6 +571,19 @@ class ReminderAgent:
         except Exception as e:
             print(f"Failed to send publish notification: {e}")
 
+# One ReminderAgent per thread: building one loads the Google credentials and the
+# Tasks API client, and that client's HTTP transport must not be shared across threads
+_local = threading.local()
+
+
+def get_reminder_agent() -> ReminderAgent:
+    """Get or create this thread's shared ReminderAgent."""
+    agent = getattr(_local, 'agent', None)
+    if agent is None:
+        agent = _local.agent = ReminderAgent()
+    return agent
+
+
 def main():
     agent = ReminderAgent()
     while True:
@@ -3,7 +3,7 @@ import time
 from datetime import datetime, timedelta
 
 from apscheduler.schedulers.background import BackgroundScheduler
-from reminder import ReminderAgent
+from reminder import get_reminder_agent
 from db import get_db, get_all_tasks, get_all_works, Work, Task
 from celery_app import async_assign_task
 
@@ -12,14 +12,13 @@ from celery_app import async_assign_task
 def scheduled_task(task):
     # This function is triggered by APScheduler at the scheduled time.
     print(f"[Scheduler] Triggered at {datetime.now().isoformat()} for task: {task.title}")
-    # Convert the Task object to a dictionary and queue it for asynchronous processing.
-    task_data = {"id": task.id, "title": task.title, "status": task.status, "due_date": str(task.due_date)}
-    async_assign_task.delay(task_data)
+    # Queue just the ID; the worker loads the task and builds its (isoformat) payload itself
+    async_assign_task.delay({"task_id": task.id})
     print("[Scheduler] Task has been queued for asynchronous processing via Celery.")
 
 def overnight_batch():
     print(f"[Scheduler] Running overnight batch at {datetime.now().isoformat()}")
-    agent = ReminderAgent()
+    agent = get_reminder_agent()
     db_gen = get_db()
     db = next(db_gen)
     # 1. Sync calendar event statuses & update DB
@@ -76,7 +75,7 @@ def overnight_batch():
     db.close()
 
 def daily_reminder():
-    agent = ReminderAgent()
+    agent = get_reminder_agent()
     agent.send_daily_reminder()
 
 
@@ -87,9 +86,8 @@ if __name__ == "__main__":
     # Schedule daily Slack reminder at 6am
     scheduler.add_job(daily_reminder, 'cron', hour=6, minute=0)
     # Schedule watch renewal every 30 minutes
-    from reminder import ReminderAgent
     def renew_watches_job():
-        agent = ReminderAgent()
+        agent = get_reminder_agent()
         agent.renew_all_watches()
     scheduler.add_job(renew_watches_job, 'interval', minutes=30)
     scheduler.start()
@@ -1,11 +1,12 @@
 
 import datetime
-import requests
 import logging
 import os
 from dotenv import load_dotenv
 from flask import Flask, request, jsonify
 
+from core.slack import WEBHOOK_TIMEOUT, get_http_session
+
 # Define the scopes and timezone.
 SCOPES = ['https://www.googleapis.com/auth/tasks']
 TIMEZONE = 'Europe/London'
@@ -85,9 +86,9 @@ def slack_interactivity():
                             task.due_date = datetime.datetime.strptime(due_str, '%Y-%m-%d')
                     db.commit()
                 # Respond to Slack
-                slack_response = requests.post(response_url, json={
+                slack_response = get_http_session().post(response_url, json={
                     "text": f"Due dates updated for Work ID {work_id} by {user}."
-                })
+                }, timeout=WEBHOOK_TIMEOUT)
                 logging.info(f"Slack response status: {slack_response.status_code}, body: {slack_response.text}")
                 logging.info(f"Due dates updated for Work ID {work_id} by {user}.")
                 return jsonify({"response_type": "ephemeral", "text": "Due dates updated!"}), 200
@@ -106,7 +107,7 @@ def slack_interactivity():
 def notify_work(work_id):
     """Trigger the interactive Slack notification for a specific work item."""
     from contextlib import contextmanager
-    from reminder import ReminderAgent
+    from reminder import get_reminder_agent
     from db import get_db, Work
     from sqlalchemy.orm import joinedload
 
@@ -120,7 +121,7 @@ def notify_work(work_id):
             db.close()
 
     try:
-        agent = ReminderAgent()
+        agent = get_reminder_agent()
         with db_session() as db:
             work = db.query(Work).options(joinedload(Work.tasks)).filter(Work.id == work_id).first()
         if not work:
@@ -138,8 +139,8 @@ def notify_work(work_id):
 def notify_latest_work():
     """Trigger the interactive Slack notification for the latest work item."""
     try:
-        from reminder import ReminderAgent
-        agent = ReminderAgent()
+        from reminder import get_reminder_agent
+        agent = get_reminder_agent()
         latest_work = agent.fetch_latest_work()
         if not latest_work:
             logging.warning("No latest work found to send interactive notification.")
@@ -184,7 +185,7 @@ def send_interactive_work_notification(work, slack_webhook_url):
         ]
     })
     payload = {"blocks": blocks, "text": "Please confirm or update due dates for these tasks."}
-    requests.post(slack_webhook_url, json=payload)
+    get_http_session().post(slack_webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
 
 
 def send_publish_work_notification(work, slack_webhook_url):
@@ -226,7 +227,7 @@ def send_publish_work_notification(work, slack_webhook_url):
             })
 
         payload = {"blocks": blocks, "text": f"Work '{work.title}' published."}
-        requests.post(slack_webhook_url, json=payload)
+        get_http_session().post(slack_webhook_url, json=payload, timeout=WEBHOOK_TIMEOUT)
         logging.info(f"Sent publish notification for Work ID {getattr(work, 'id', 'unknown')}")
     except Exception as e:
         logging.exception(f"Failed to send publish notification for work: {e}")
@@ -253,8 +254,8 @@ def calendar_push():
     if not event_id:
         return jsonify({"status": "error", "message": "No event_id or resourceId found in payload."}), 400
     try:
-        from reminder import ReminderAgent
-        agent = ReminderAgent()
+        from reminder import get_reminder_agent
+        agent = get_reminder_agent()
         agent.process_event_by_id(event_id)
         return jsonify({"status": "success", "message": f"Processed event {event_id}"}), 200
     except Exception as e:
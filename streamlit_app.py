@@ -277,6 +277,7 @@ elif page == "Agent Console":
     # Agent Console page (top-level branch so it renders when selected)
     try:
         from master import Agent, TOOLS
+        from master.notify_queue import get_notification_queue
         have_agent = True
     except Exception:
         have_agent = False
@@ -342,7 +343,7 @@ elif page == "Agent Console":
 
         # Render the trail with inline controls. Each entry shows plan, explanation and
         # offers Confirm / Execute buttons depending on the plan's 'confirm' flag.
-        mutating_tools = {'create_work', 'publish_work', 'schedule_task_to_calendar', 'queue_celery_task'}
+        mutating_tools = {'create_work', 'publish_work', 'schedule_task_to_calendar', 'queue_celery_task', 'queue_celery_tasks'}
 
         def _prepare_and_call_tool(action_name, action_args):
             agent_obj = st.session_state['agent']
@@ -422,6 +423,8 @@ elif page == "Agent Console":
                             else:
                                 with st.spinner("Executing..."):
                                     res = _prepare_and_call_tool(action, args or {})
+                                    # Send any Slack notifications the tool queued
+                                    get_notification_queue().flush()
                                     entry['status'] = 'done'
                                     entry['result'] = res
                                     # store back into session trail
@@ -13,6 +13,7 @@ sys.path.insert(0, '.')
 
 from core.feedback import (
     log_conversation_feedback,
+    log_conversation_feedback_bulk,
     get_recent_feedback,
     generate_learning_summary_from_feedback,
     apply_learning_summary,
@@ -59,6 +60,29 @@ def test_log_feedback():
     return feedback_id1, feedback_id2, feedback_id3
 
 
+def test_log_feedback_bulk():
+    """Test logging several feedback records in one write."""
+    print("\n=== Testing Bulk Feedback Logging ===")
+    
+    ids = log_conversation_feedback_bulk([
+        {
+            "conversation_summary": "Snoozed two tasks to next week",
+            "user_satisfaction_estimate": "High",
+            "context_tags": ["snoozing"]
+        },
+        {
+            "conversation_summary": "Checked progress on 'Q4 report'",
+            "what_went_well": "Quick status summary",
+        },
+    ])
+    
+    assert len(ids) == 2 and all(ids), f"Expected two feedback IDs, got {ids}"
+    assert log_conversation_feedback_bulk([]) == []
+    print(f"✓ Logged bulk feedback: IDs {ids}")
+    
+    return ids
+
+
 def test_retrieve_feedback():
     """Test retrieving recent feedback."""
     print("\n=== Testing Feedback Retrieval ===")
@@ -161,6 +185,7 @@ def run_all_tests():
     try:
         # Test feedback logging
         ids = test_log_feedback()
+        bulk_ids = test_log_feedback_bulk()
         
         # Test retrieval
         feedback_logs = test_retrieve_feedback()
@@ -35,6 +35,7 @@ def simulate_good_conversation():
     
     # End session
     tracker.end_session(session_id, explicit=True)
+    tracker.flush_feedback(timeout=5)
     print("✓ Session ended, feedback logged")
 
 
@@ -66,6 +67,7 @@ def simulate_problematic_conversation():
     
     # End session
     tracker.end_session(session_id, explicit=True)
+    tracker.flush_feedback(timeout=5)
     print("✓ Session ended, feedback logged")
 
 
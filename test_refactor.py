@@ -88,6 +88,210 @@ def test_storage():
         return False
 
 
+def _seed_work(title, tasks=(), status='Published'):
+    """Insert a work with (title, status, due_date) tasks; returns the work ID."""
+    from db import SessionLocal, Work, Task
+    
+    session = SessionLocal()
+    try:
+        work = Work(title=title, description='', status=status, tasks=[
+            Task(title=task_title, status=task_status, due_date=due_date)
+            for task_title, task_status, due_date in tasks
+        ])
+        session.add(work)
+        session.commit()
+        return work.id
+    finally:
+        session.close()
+
+
+def _delete_works(work_ids):
+    """Delete seeded works (their tasks cascade)."""
+    from db import SessionLocal, Work
+    
+    session = SessionLocal()
+    try:
+        for work in session.query(Work).filter(Work.id.in_(work_ids)).all():
+            session.delete(work)
+        session.commit()
+    finally:
+        session.close()
+
+
+def test_works_with_counts():
+    """Test per-work task counts aggregated in SQL, including works with no tasks."""
+    print("\nTesting work task counts...")
+    
+    from core.storage import list_works_with_counts
+    from core.work import WorkStatus
+    
+    work_ids = [
+        _seed_work("Counts: empty"),
+        _seed_work("Counts: mixed", [
+            ("A", "Completed", None), ("B", "Published", None), ("C", "Draft", None),
+        ]),
+        _seed_work("Counts: draft", [("A", "Completed", None)], status='Draft'),
+    ]
+    try:
+        counts = {work.id: (total, completed) for work, total, completed in list_works_with_counts()}
+        assert counts[work_ids[0]] == (0, 0), "Works without tasks are listed with zero counts"
+        assert counts[work_ids[1]] == (3, 1)
+        assert counts[work_ids[2]] == (1, 1)
+        
+        published = {work.id for work, _, _ in list_works_with_counts(WorkStatus.PUBLISHED)}
+        assert work_ids[0] in published and work_ids[1] in published
+        assert work_ids[2] not in published
+    finally:
+        _delete_works(work_ids)
+    
+    print("✓ Work task count tests passed")
+
+
+def test_next_tasks_by_work():
+    """Test each work's next open task is picked in SQL, undated tasks last."""
+    print("\nTesting next task per work...")
+    
+    from core.storage import list_next_tasks_by_work
+    
+    due = datetime(2030, 1, 10)
+    work_ids = [
+        _seed_work("Next: mixed", [
+            ("Undated", "Published", None),
+            ("Later", "Published", due + timedelta(days=3)),
+            ("Done early", "Completed", due - timedelta(days=5)),
+            ("Earliest open", "Tracked", due),
+        ]),
+        _seed_work("Next: undated", [
+            ("First undated", "Draft", None), ("Second undated", "Draft", None),
+        ]),
+        _seed_work("Next: all done", [("Done", "Completed", due)]),
+        _seed_work("Next: empty"),
+    ]
+    try:
+        rows = {row.work_id: row for row in list_next_tasks_by_work(status=None)}
+        
+        mixed = rows[work_ids[0]]
+        assert mixed.task_title == "Earliest open"
+        assert mixed.remaining_tasks == 3, "Completed tasks don't count as remaining"
+        
+        undated = rows[work_ids[1]]
+        assert undated.task_title == "First undated" and undated.due_date is None
+        assert undated.remaining_tasks == 2
+        
+        # Works with no open tasks are omitted
+        assert work_ids[2] not in rows and work_ids[3] not in rows
+    finally:
+        _delete_works(work_ids)
+    
+    print("✓ Next task per work tests passed")
+
+
+def test_overdue_task_rows():
+    """Test days overdue computed in SQL matches timedelta.days at day boundaries."""
+    print("\nTesting overdue task rows...")
+    
+    from core.storage import list_overdue_task_rows
+    
+    now = datetime(2030, 1, 10, 12, 0, 0)
+    cases = {
+        "Just under a day": now - timedelta(days=1) + timedelta(seconds=1),
+        "Exactly a day": now - timedelta(days=1),
+        "Just over two days": now - timedelta(days=2, seconds=1),
+        "Previous midnight": datetime(2030, 1, 10),
+    }
+    work_id = _seed_work("Overdue: boundaries", [
+        *((title, "Published", due_date) for title, due_date in cases.items()),
+        ("Due now", "Published", now),
+        ("Done", "Completed", now - timedelta(days=3)),
+        ("Undated", "Published", None),
+    ])
+    try:
+        rows = {row.title: row for row in list_overdue_task_rows(now) if row.work_title == "Overdue: boundaries"}
+        assert set(rows) == set(cases), "Only open tasks due strictly before now are overdue"
+        for title, due_date in cases.items():
+            assert rows[title].days_overdue == (now - due_date).days, title
+        assert rows["Just under a day"].days_overdue == 0
+        assert rows["Exactly a day"].days_overdue == 1
+        assert rows["Just over two days"].days_overdue == 2
+        assert list(rows)[0] == "Just over two days", "Most overdue first"
+    finally:
+        _delete_works([work_id])
+    
+    print("✓ Overdue task row tests passed")
+
+
+def test_eager_loading():
+    """Test that list_works(include_tasks=True) attaches tasks without lazy loads."""
+    print("\nTesting eager loading...")
+    
+    from sqlalchemy.orm import raiseload, selectinload
+    from db import SessionLocal, Work
+    from core.storage import list_works
+    
+    works = list_works(include_tasks=True)
+    # Detached objects must already carry their tasks
+    total = sum(len(w.tasks) for w in works)
+    print(f"  Loaded {len(works)} works with {total} tasks")
+    
+    # Any other relationship touched lazily should fail loudly
+    session = SessionLocal()
+    try:
+        works = session.query(Work).options(
+            selectinload(Work.tasks), raiseload('*')
+        ).all()
+        for work in works:
+            for task in work.tasks:
+                _ = task.status
+    finally:
+        session.close()
+    
+    # Publish notification lookup loads a single task, never the work's task list
+    from core.storage import get_work_by_id, get_calendar_task_for_work
+    for work in works[:3]:
+        bare = get_work_by_id(work.id, include_tasks=False)
+        assert 'tasks' not in bare.__dict__, "Tasks should not be loaded"
+        task = get_calendar_task_for_work(work.id)
+        assert task is None or task.work_id == work.id
+    
+    print("✓ Eager loading tests passed")
+
+
+def test_completion_cache():
+    """Test the exact-match LLM completion cache."""
+    print("\nTesting completion cache...")
+    
+    from unittest import mock
+    from core.llm import CompletionCache, _client_for, get_client
+    
+    # One client (and connection pool) is shared per credentials; a dummy key lets
+    # OpenAI() be constructed without real credentials
+    with mock.patch.dict(os.environ, {'OPENAI_API_KEY': 'sk-test'}):
+        try:
+            assert get_client() is get_client()
+        finally:
+            _client_for.cache_clear()
+    
+    cache = CompletionCache(max_size=2)
+    messages = [{"role": "user", "content": "Plan a party"}]
+    key = CompletionCache.make_key("gpt-3.5-turbo", 0.2, messages)
+    assert key == CompletionCache.make_key("gpt-3.5-turbo", 0.2, list(messages))
+    assert key != CompletionCache.make_key("gpt-3.5-turbo", 0.7, messages)
+    
+    cache.put(key, '{"subtasks": []}')
+    assert cache.get(key) == '{"subtasks": []}'
+    
+    # Empty replies are never cached; oldest entry is evicted past max_size
+    cache.put("empty", "")
+    assert cache.get("empty") is None
+    cache.put("b", "B")
+    cache.get(key)
+    cache.put("c", "C")
+    assert cache.get("b") is None, "Least recently used entry should be evicted"
+    assert cache.get(key) is not None
+    
+    print("✓ Completion cache tests passed")
+
+
 def test_slack_notifier():
     """Test Slack notifier initialization."""
     print("\nTesting Slack notifier...")
@@ -110,6 +314,174 @@ def test_slack_notifier():
         return False
 
 
+def test_notification_queue():
+    """Test queued Slack notifications are merged and sent as one post per session."""
+    print("\nTesting notification queue...")
+    
+    from master.notify_queue import NotificationQueue
+    from core.slack import get_notifier
+    
+    sent = []
+    notifier = get_notifier()
+    original_send_batch = notifier.send_batch
+    notifier.send_batch = lambda messages, **kwargs: sent.append(messages) or True
+    try:
+        queue = NotificationQueue()
+        assert queue.flush()  # Nothing pending
+        assert not sent
+        
+        queue.add_changes(1, "Q4 report", ["Task 1 done"])
+        queue.add_message("Heads up")
+        queue.add_changes(1, "Q4 report", ["Task 2 rescheduled"])
+        assert len(queue) == 2
+        
+        assert queue.flush()
+        assert len(sent) == 1
+        assert sent[0][0] == "🔔 *Q4 report* - Updates\n  • Task 1 done\n  • Task 2 rescheduled"
+        assert sent[0][1] == "Heads up"
+        assert len(queue) == 0
+        
+        # Each session's notifications are flushed on their own
+        queue.add_message("For session A", scope="a")
+        queue.add_message("For session B", scope="b")
+        assert queue.pending_count("a") == 1 and len(queue) == 2
+        assert queue.flush("a")
+        assert sent[-1] == ["For session A"]
+        assert queue.pending_count("b") == 1
+        assert queue.flush_all()
+        assert sent[-1] == ["For session B"]
+        assert len(queue) == 0
+    finally:
+        notifier.send_batch = original_send_batch
+    
+    print("✓ Notification queue tests passed")
+
+
+def test_read_cache_scopes():
+    """Test cached reads are kept per session and invalidated per session or on writes."""
+    print("\nTesting read cache scopes...")
+    
+    import contextvars
+    from master import read_cache
+    from master.notify_queue import set_notification_scope
+    
+    calls = []
+    
+    @read_cache.ttl_cache(seconds=60)
+    def probe(value):
+        calls.append(value)
+        return {'value': value}
+    
+    @read_cache.invalidates
+    def write():
+        return {}
+    
+    def read_in(scope):
+        """Call probe as a tool would during one of scope's turns."""
+        def run():
+            set_notification_scope(scope)
+            return probe(1)
+        return contextvars.copy_context().run(run)
+    
+    read_in("a")
+    read_in("a")
+    read_in("b")
+    assert len(calls) == 2, "Each session caches its own reads"
+    
+    read_cache.invalidate(scope="a")  # Session a starts a new turn
+    read_in("a")
+    read_in("b")
+    assert len(calls) == 3, "Only session a's reads are dropped"
+    
+    write()  # Data changed: every session's reads are dropped
+    read_in("a")
+    read_in("b")
+    assert len(calls) == 5
+    read_cache.invalidate()
+    
+    print("✓ Read cache scope tests passed")
+
+
+def test_upcoming_events_cache():
+    """Test upcoming events are served from the snapshot until marked stale."""
+    print("\nTesting upcoming events cache...")
+    
+    import agent_api
+    from master.upcoming_events import UpcomingEventsCache
+    
+    calls = []
+    original_fetch = agent_api.fetch_calendar_tasks
+    agent_api.fetch_calendar_tasks = lambda: calls.append(1) or [{'id': str(len(calls))}]
+    cache = UpcomingEventsCache(refresh_interval=3600)
+    try:
+        events, as_of = cache.get()
+        assert events == [{'id': '1'}] and as_of is not None
+        events, _ = cache.get()
+        assert events == [{'id': '1'}]  # Served from the snapshot
+        assert len(calls) == 1
+        
+        cache.mark_stale()
+        events, _ = cache.get()
+        assert events == [{'id': '2'}]
+        assert len(calls) == 2
+    finally:
+        cache.stop()
+        agent_api.fetch_calendar_tasks = original_fetch
+    
+    print("✓ Upcoming events cache tests passed")
+
+
+def test_reschedule_sync_dispatch():
+    """Test bulk reschedules hand remote syncs to the dispatcher, falling back to inline."""
+    print("\nTesting reschedule sync dispatch...")
+    
+    import agent_api
+    from core import scheduling
+    from db import SessionLocal, Task
+    from core.storage import get_task_by_id, update_task_calendar_event
+    
+    class FakeProvider:
+        def __init__(self):
+            self.updated = []
+        
+        def update_task(self, event_id, due=None):
+            self.updated.append((event_id, due))
+            return True
+    
+    registered = scheduling._due_date_sync_dispatcher
+    assert registered is agent_api._queue_due_date_sync
+    original_get_provider = scheduling.get_provider
+    provider = FakeProvider()
+    scheduling.get_provider = lambda: provider
+    work_id = _seed_work("Reschedule: sync", [("Synced", "Published", None), ("Local", "Draft", None)])
+    try:
+        session = SessionLocal()
+        try:
+            synced, local = [t.id for t in session.query(Task).filter_by(work_id=work_id).order_by(Task.id)]
+        finally:
+            session.close()
+        update_task_calendar_event(synced, 'gtask-1')
+        due = datetime(2030, 1, 2, 8, 0)
+        
+        jobs = []
+        scheduling.set_due_date_sync_dispatcher(lambda job: jobs.append(job) or True)
+        assert scheduling.reschedule_tasks({synced: due, local: due}) == {synced: True, local: True}
+        assert jobs == [[['gtask-1', due.isoformat()]]]  # Only tasks with a Google Task
+        assert provider.updated == []
+        assert get_task_by_id(local).due_date == due
+        
+        # A dispatcher that cannot queue leaves the sync to run inline
+        scheduling.set_due_date_sync_dispatcher(lambda job: False)
+        scheduling.reschedule_tasks({synced: due})
+        assert provider.updated == [('gtask-1', due)]
+    finally:
+        scheduling.set_due_date_sync_dispatcher(registered)
+        scheduling.get_provider = original_get_provider
+        _delete_works([work_id])
+    
+    print("✓ Reschedule sync dispatch tests passed")
+
+
 def test_tasks_provider():
     """Test Google Tasks provider initialization."""
     print("\nTesting Google Tasks provider...")
@@ -194,6 +566,39 @@ def test_tools():
         return False
 
 
+def test_refine_subtasks():
+    """Test subtask refinement parses remove/add:/reorder: feedback."""
+    print("\nTesting subtask refinement...")
+    
+    from master.tools import tool_refine_subtasks
+    
+    def refine(feedback):
+        return tool_refine_subtasks(["A", "B", "C"], feedback)["refined_subtasks"]
+    
+    assert refine("remove 2") == ["A", "C"]
+    assert refine("add: D; - E\nF") == ["A", "B", "C", "D", "E", "F"]
+    assert refine("add: D add: E") == ["A", "B", "C", "D"]  # Text after a second 'add:' is dropped
+    assert refine("reorder: 3,1,2") == ["C", "A", "B"]
+    assert refine("reorder: 3,1,2 please") == ["C", "A", "B"]
+    assert refine("Reorder: 2,3,1") == ["B", "C", "A"]  # Reorder is case-insensitive
+    assert refine("reorder: 3,1") == ["A", "B", "C"]  # Wrong count leaves the order alone
+    assert refine("reorder:") == ["A", "B", "C"]
+    
+    print("✓ Subtask refinement tests passed")
+
+
+def _passed(test) -> bool:
+    """Run an assert-style test for main(), reporting a failure instead of raising."""
+    try:
+        test()
+        return True
+    except Exception as e:
+        print(f"✗ {test.__name__} failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def main():
     """Run all validation tests."""
     print("=" * 60)
@@ -205,10 +610,20 @@ def main():
     results.append(("Imports", test_imports()))
     results.append(("Enums", test_enums()))
     results.append(("Storage", test_storage()))
+    results.append(("Work Task Counts", _passed(test_works_with_counts)))
+    results.append(("Next Task Per Work", _passed(test_next_tasks_by_work)))
+    results.append(("Overdue Task Rows", _passed(test_overdue_task_rows)))
+    results.append(("Eager Loading", _passed(test_eager_loading)))
+    results.append(("Completion Cache", _passed(test_completion_cache)))
     results.append(("Slack Notifier", test_slack_notifier()))
+    results.append(("Notification Queue", _passed(test_notification_queue)))
+    results.append(("Read Cache Scopes", _passed(test_read_cache_scopes)))
+    results.append(("Upcoming Events Cache", _passed(test_upcoming_events_cache)))
+    results.append(("Reschedule Sync Dispatch", _passed(test_reschedule_sync_dispatch)))
     results.append(("Google Tasks Provider", test_tasks_provider()))
     results.append(("Agent API", test_agent_api()))
     results.append(("Master Tools", test_tools()))
+    results.append(("Refine Subtasks", _passed(test_refine_subtasks)))
     
     print("\n" + "=" * 60)
     print("SUMMARY")
@@ -4,9 +4,11 @@
 import sys
 import time
 from datetime import datetime
+from threading import Thread
 
 sys.path.insert(0, '.')
 
+from master import session_tracker
 from master.session_tracker import SessionTracker, ConversationSession
 
 
@@ -148,6 +150,201 @@ def test_problematic_conversation():
     return session
 
 
+def test_repeated_question_memory_is_bounded():
+    """Test repeated-question detection keeps a bounded record of past questions."""
+    print("\n=== Testing Repeated Question Tracking ===")
+    
+    session = ConversationSession("many-questions")
+    for i in range(3 * session_tracker.MAX_SESSION_MESSAGES):
+        session.add_message("assistant", f"Should task {i} move to Friday?")
+    assert not session.has_repeated_question
+    assert len(session.seen_questions) == session_tracker.MAX_SESSION_MESSAGES
+    
+    session.add_message("assistant", f"Should task {3 * session_tracker.MAX_SESSION_MESSAGES - 1} move to Friday?")
+    assert session.has_repeated_question
+    assert "Repeated similar questions" in session.analyze_quality()['what_could_improve']
+    
+    print("✓ Repeated question detected with bounded memory")
+
+
+def test_long_message_markers():
+    """Test quality markers are found anywhere in a long message, context tags only near its ends."""
+    print("\n=== Testing Long Message Scanning ===")
+    
+    session = ConversationSession("long-message")
+    filler = "x" * (session_tracker.SCAN_WINDOW + session_tracker.SCAN_TAIL)
+    session.add_message("assistant", f"Here is the log:\n{filler}\nerror: deadline missing\n{filler}\nDone.")
+    assert session.has_error_marker
+    assert 'due_dates' not in session.context_tags  # 'deadline' sits outside the scanned ends
+    
+    session.add_message("assistant", f"Created work 12.\n{filler}\nShould I publish it?")
+    assert session.work_created_marker and session.confirmation_count == 1
+    
+    print("✓ Markers found in the middle of long messages")
+
+
+def test_clock_cache_cold_start():
+    """Test sessions created concurrently on a cold clock cache all get a start time."""
+    print("\n=== Testing Clock Cache Cold Start ===")
+    
+    session_tracker._clock_cache = (0.0, datetime.utcfromtimestamp(0))
+    started = []
+    
+    def start_sessions():
+        for i in range(100):
+            started.append(ConversationSession(f"cold-{i}").started_at)
+    
+    threads = [Thread(target=start_sessions) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert len(started) == 800 and all(started)
+    assert abs((session_tracker._now_cached() - datetime.utcnow()).total_seconds()) < 2
+    
+    print("✓ Every session got a current start time")
+
+
+class _RecordingTracker(SessionTracker):
+    """SessionTracker that collects ended sessions instead of logging their feedback."""
+    
+    def __init__(self, *args, **kwargs):
+        self.ended = []
+        super().__init__(*args, **kwargs)
+    
+    def _finalize(self, session, explicit):
+        self.ended.append((session, explicit))
+
+
+def test_end_session_races_track_message():
+    """Test ending a session while messages for it (and its shard) keep arriving."""
+    print("\n=== Testing end_session / track_message Race ===")
+    
+    tracker = _RecordingTracker(check_interval=3600)
+    # Another session on the same shard, tracked throughout
+    neighbour = next(sid for sid in (f"neighbour-{i}" for i in range(1000))
+                     if tracker._shard(sid) is tracker._shard("racing"))
+    count = 20000
+    
+    def send(session_id):
+        for i in range(count):
+            tracker.track_message(session_id, "user", f"message {i}")
+    
+    senders = [Thread(target=send, args=("racing",)), Thread(target=send, args=(neighbour,))]
+    
+    def end():
+        while any(sender.is_alive() for sender in senders):
+            tracker.end_session("racing")
+            time.sleep(0)
+    
+    threads = senders + [Thread(target=end)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        tracker.end_session("racing")
+        
+        # Every message landed in exactly one ended session, each ended once
+        ended = [session for session, _ in tracker.ended if session.session_id == "racing"]
+        assert len({id(session) for session in ended}) == len(ended)
+        assert sum(session.message_count for session in ended) == count
+        assert all(session.completed for session in ended)
+        assert "racing" not in tracker.sessions
+        assert tracker.sessions[neighbour].message_count == count
+    finally:
+        tracker.shutdown()
+    
+    print(f"✓ {count} messages split across {len(ended)} ended sessions, none lost")
+
+
+def _rewind(tracker, seconds):
+    """Simulate `seconds` passing by making the tracker's deadlines and activity older."""
+    with tracker._expiry_lock:
+        tracker._expiry_heap[:] = [(deadline - seconds, sid) for deadline, sid in tracker._expiry_heap]
+    for session in tracker.sessions.values():
+        session.last_activity -= seconds
+
+
+def test_expiry_requeues_active_session():
+    """Test a due heap entry re-queues a session active since, and ends an idle one."""
+    print("\n=== Testing Expiry Heap Re-queue ===")
+    
+    tracker = _RecordingTracker(inactivity_timeout=1, check_interval=3600)
+    # Drive cleanup by hand against simulated time
+    tracker._stop_evt.set()
+    tracker.cleanup_thread.join()
+    try:
+        tracker.track_message("active", "user", "Show me today's tasks")
+        tracker.track_message("idle", "user", "Show me today's tasks")
+        
+        _rewind(tracker, 45)
+        tracker.track_message("active", "user", "And tomorrow's?")
+        _rewind(tracker, 20)  # Both first deadlines are now 5s past
+        
+        tracker._cleanup_inactive_sessions()
+        assert [(session.session_id, explicit) for session, explicit in tracker.ended] == [("idle", False)]
+        assert "active" in tracker.sessions
+        # Re-queued once, at its new deadline (last activity 20s ago + 60s)
+        assert [sid for _, sid in tracker._expiry_heap] == ["active"]
+        assert 39 < tracker._expiry_heap[0][0] - time.monotonic() <= 40
+        
+        _rewind(tracker, 41)
+        tracker._cleanup_inactive_sessions()
+        assert [session.session_id for session, _ in tracker.ended] == ["idle", "active"]
+        assert not tracker.sessions and not tracker._expiry_heap
+    finally:
+        tracker.shutdown()
+    
+    print("✓ Active session re-queued, idle sessions ended")
+
+
+class _SlowFeedbackApi:
+    """Stands in for agent_api: records feedback writes, each taking `delay` seconds."""
+    
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.written = []
+    
+    def record_conversation_feedback_bulk(self, feedback):
+        time.sleep(self.delay)
+        self.written.extend(feedback)
+        return list(range(len(self.written) - len(feedback) + 1, len(self.written) + 1))
+
+
+def _track_conversation(tracker, session_id):
+    """Track a short, substantial conversation."""
+    tracker.track_message(session_id, "user", "Create a work item for the Q4 report")
+    tracker.track_message(session_id, "assistant", "Created work ID 10")
+    tracker.track_message(session_id, "user", "Thanks")
+
+
+def test_shutdown_drains_feedback():
+    """Test shutdown ends open sessions and waits for their queued feedback writes."""
+    print("\n=== Testing Shutdown Feedback Drain ===")
+    
+    api = _SlowFeedbackApi(delay=0.2)
+    original_api = session_tracker._agent_api
+    session_tracker._agent_api = api
+    try:
+        tracker = SessionTracker(check_interval=3600)
+        _track_conversation(tracker, "ended-early")
+        tracker.end_session("ended-early")  # Worker is busy writing this one...
+        _track_conversation(tracker, "open-1")
+        _track_conversation(tracker, "open-2")
+        
+        tracker.shutdown()  # ...while these two are queued behind it
+        
+        assert len(api.written) == 3, "Shutdown returned before queued feedback was written"
+        assert tracker._feedback_q.unfinished_tasks == 0
+        assert not tracker.sessions
+    finally:
+        session_tracker._agent_api = original_api
+    
+    print("✓ Feedback for all 3 sessions written before shutdown returned")
+
+
 def run_all_tests():
     """Run all session tracking tests."""
     print("=" * 60)
@@ -164,6 +361,14 @@ def run_all_tests():
         # Test problematic patterns
         prob_session = test_problematic_conversation()
         
+        # Test tracker concurrency and expiry (fast, no real timeouts)
+        test_repeated_question_memory_is_bounded()
+        test_long_message_markers()
+        test_clock_cache_cold_start()
+        test_end_session_races_track_message()
+        test_expiry_requeues_active_session()
+        test_shutdown_drains_feedback()
+        
         # Test session tracker (this includes timeout, so it's slow)
         print("\n" + "=" * 60)
         print("Note: Session tracker test includes timeout testing")